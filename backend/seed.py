@@ -0,0 +1,34 @@
+"""Seed the database with the sample assessment content and default users.
+
+Run once per deployment from the backend directory, with the same environment as the API:
+
+    python seed.py
+
+The seeder writes to Mongo directly, so API workers that are already running don't see it through their own
+writes. On a replica set their change streams pick it up; on a standalone server they keep serving the cached
+(possibly empty) taxonomy until TAXONOMY_CACHE_TTL expires, so restart them to serve the new data at once.
+"""
+import asyncio
+import os
+
+from pymongo import AsyncMongoClient
+
+from server import TAXONOMY_CACHE_TTL, mongo_url, seed_sample_data
+
+
+async def main():
+    client = AsyncMongoClient(mongo_url)
+    try:
+        result = await seed_sample_data(client[os.environ['DB_NAME']])
+    finally:
+        await client.close()
+    print(result["message"])
+    if "domains_created" in result:
+        print(
+            f"Running API workers may serve their cached taxonomy for up to {TAXONOMY_CACHE_TTL}s unless change "
+            "streams are available (replica set); restart them to serve the new data immediately."
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
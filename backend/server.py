@@ -1,29 +1,46 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, Query, Request
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import AsyncMongoClient
+from pymongo.errors import DuplicateKeyError, OperationFailure, PyMongoError
 import os
+import asyncio
+import base64
+import json
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 import uuid
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+import hmac
 import bcrypt
 import jwt
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+import orjson
+from cachetools import TTLCache
 
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
-# MongoDB connection
+# MongoDB connection - the client is created per worker on startup so its pool is bound to that worker's event loop
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
-db = client[os.environ['DB_NAME']]
+MONGO_POOL_SIZE = int(os.environ.get('MONGO_POOL_SIZE', '200'))
+MONGO_MIN_POOL_SIZE = int(os.environ.get('MONGO_MIN_POOL_SIZE', '20'))
+MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.environ.get('MONGO_WAIT_QUEUE_TIMEOUT_MS', '2000'))
+MONGO_COMPRESSORS = os.environ.get('MONGO_COMPRESSORS', 'zlib')
+client: Optional[AsyncMongoClient] = None
+db = None
+invalidation_task: Optional[asyncio.Task] = None
 
 # Create the main app without a prefix
-app = FastAPI(title="Security Assessment API")
+app = FastAPI(title="Security Assessment API", default_response_class=ORJSONResponse)
 
 # Create a router with the /api prefix
 api_router = APIRouter(prefix="/api")
@@ -31,11 +48,37 @@ api_router = APIRouter(prefix="/api")
 # JWT Configuration
 JWT_SECRET = os.environ.get('JWT_SECRET', 'your-secret-key')
 JWT_ALGORITHM = "HS256"
+_JWT_KEY = JWT_SECRET.encode('utf-8')
+# argon2id parameters for new hashes; each stored hash embeds its own parameters, so changing these never breaks
+# existing logins - outdated hashes (including legacy bcrypt ones) are upgraded on the user's next login
+ARGON2_TIME_COST = int(os.environ.get('ARGON2_TIME_COST', '2'))
+ARGON2_MEMORY_COST_KIB = int(os.environ.get('ARGON2_MEMORY_COST_KIB', '65536'))
+ARGON2_PARALLELISM = int(os.environ.get('ARGON2_PARALLELISM', '2'))
+_password_hasher = PasswordHasher(
+    time_cost=ARGON2_TIME_COST,
+    memory_cost=ARGON2_MEMORY_COST_KIB,
+    parallelism=ARGON2_PARALLELISM
+)
+# Password hashing is CPU-bound and releases the GIL, so a core's worth of threads is all the parallelism it can use
+PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', str(os.cpu_count() or 1)))
+_password_hash_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash")
+JWT_EXPIRATION_HOURS = int(os.environ.get('JWT_EXPIRATION_HOURS', '24'))
 security = HTTPBearer()
 
+# How long a worker may go without re-reading the token revocation list
+AUTH_CACHE_TTL = int(os.environ.get('AUTH_CACHE_TTL', '30'))
+
+def _uid() -> str:
+    return uuid.uuid4().hex
+
+def _uids(count: int) -> List[str]:
+    """Generate count random (version 4) ids from a single os.urandom call"""
+    buf = os.urandom(16 * count)
+    return [uuid.UUID(bytes=buf[i:i + 16], version=4).hex for i in range(0, len(buf), 16)]
+
 # Models
 class User(BaseModel):
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=_uid)
     first_name: str
     last_name: str
     organization_name: str
@@ -63,37 +106,37 @@ class UserLogin(BaseModel):
     password: str
 
 class Domain(BaseModel):
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=_uid)
     name: str
     description: Optional[str] = None
     icon: Optional[str] = None
     order: int = 0
 
 class SubDomain(BaseModel):
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=_uid)
     name: str
     domain_id: str
     description: Optional[str] = None
 
 class Control(BaseModel):
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=_uid)
     name: str
     definition: str
     subdomain_id: str
 
 class Metric(BaseModel):
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=_uid)
     name: str
     control_id: str
     description: Optional[str] = None
 
 class Answer(BaseModel):
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=_uid)
     answer_text: str
     score_value: int  # 0-5
 
 class Question(BaseModel):
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=_uid)
     question_text: str
     domain_id: str
     subdomain_id: str
@@ -101,14 +144,51 @@ class Question(BaseModel):
     metric_id: str
     answers: List[Answer]
 
+# Partial-update bodies for the admin PUT routes - only the fields a client sends are written; nulls are ignored
+# so a required field can never be cleared
+class DomainPatch(BaseModel):
+    name: Optional[str] = None
+    description: Optional[str] = None
+    icon: Optional[str] = None
+    order: Optional[int] = None
+
+class SubDomainPatch(BaseModel):
+    name: Optional[str] = None
+    domain_id: Optional[str] = None
+    description: Optional[str] = None
+
+class ControlPatch(BaseModel):
+    name: Optional[str] = None
+    definition: Optional[str] = None
+    subdomain_id: Optional[str] = None
+
+class MetricPatch(BaseModel):
+    name: Optional[str] = None
+    control_id: Optional[str] = None
+    description: Optional[str] = None
+
+class QuestionPatch(BaseModel):
+    question_text: Optional[str] = None
+    domain_id: Optional[str] = None
+    subdomain_id: Optional[str] = None
+    control_id: Optional[str] = None
+    metric_id: Optional[str] = None
+    answers: Optional[List[Answer]] = None
+
+def patch_set_doc(updates: BaseModel) -> dict:
+    # exclude_unset would also apply inside nested models and drop defaults such as Answer.id, so the
+    # top-level fields are picked here and then dumped in full
+    fields = {name for name in updates.model_fields_set if getattr(updates, name) is not None}
+    return updates.model_dump(include=fields)
+
 class UserAssessment(BaseModel):
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=_uid)
     user_id: str
     submission_date: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     status: str = "completed"  # "in_progress" or "completed"
 
 class UserResponse(BaseModel):
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=_uid)
     assessment_id: str
     user_id: str
     question_id: str
@@ -119,39 +199,294 @@ class UserResponse(BaseModel):
     control_id: str
     metric_id: str
     score_value: int
+    domain_name: Optional[str] = None
+    control_name: Optional[str] = None
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 class AssessmentSubmission(BaseModel):
     responses: List[Dict[str, str]]  # [{"question_id": "...", "selected_answer_id": "..."}]
 
+# Taxonomy cache - domains, subdomains, controls and metrics change rarely, so reads are served in-process.
+# It also versions every admin-editable collection (questions included) for the admin list ETags.
+class TaxonomyCache:
+    COLLECTIONS = ("domains", "subdomains", "controls", "metrics")
+    
+    def __init__(self, ttl: int = 300):
+        self._ttl = ttl
+        self._cache = TTLCache(maxsize=2 * len(self.COLLECTIONS), ttl=ttl)
+        # Per-collection change counters behind the admin list ETags. Counters only see this worker's writes,
+        # so ETags also roll over every ttl seconds, bounding staleness the same way the cached reads are.
+        self._versions: Dict[str, int] = {}
+        self._generation = 0
+        self._instance = _uid()[:8]
+    
+    async def get(self, name: str) -> List[Dict[str, Any]]:
+        """Return all documents of a taxonomy collection (without _id). Callers must not mutate them."""
+        docs = self._cache.get(name)
+        if docs is None:
+            version = self.version(name)
+            cursor = db[name].find({}, {"_id": 0})
+            if name == "domains":
+                cursor = cursor.sort("order", 1)
+            docs = await cursor.to_list(length=None)
+            # A write invalidated while the query was in flight may be missing from docs, so they are returned uncached
+            if self.version(name) == version:
+                self._cache[name] = docs
+        return docs
+    
+    async def get_map(self, name: str) -> Dict[str, Dict[str, Any]]:
+        """Return the documents of a taxonomy collection keyed by id."""
+        key = f"{name}:by_id"
+        docs_by_id = self._cache.get(key)
+        if docs_by_id is None:
+            version = self.version(name)
+            docs_by_id = {doc["id"]: doc for doc in await self.get(name)}
+            if self.version(name) == version:
+                self._cache[key] = docs_by_id
+        return docs_by_id
+    
+    def version(self, name: str) -> Tuple[int, int]:
+        """Return a value that changes whenever this worker writes to the collection."""
+        return self._generation, self._versions.get(name, 0)
+    
+    def etag(self, name: str) -> str:
+        """Return the current ETag for a collection's admin listing."""
+        epoch = int(time.time()) // self._ttl
+        generation, version = self.version(name)
+        return f'"{name}-{self._instance}-{generation}.{version}-{epoch}"'
+    
+    def invalidate(self, name: str):
+        """Mark a collection as changed; also accepts collections whose documents aren't cached (questions)."""
+        self._cache.pop(name, None)
+        self._cache.pop(f"{name}:by_id", None)
+        self._versions[name] = self._versions.get(name, 0) + 1
+    
+    def clear(self):
+        self._cache.clear()
+        self._generation += 1
+
+TAXONOMY_CACHE_TTL = int(os.environ.get('TAXONOMY_CACHE_TTL', '300'))
+taxonomy_cache = TaxonomyCache(ttl=TAXONOMY_CACHE_TTL)
+
+# Serialized bodies of read-heavy GETs. Keys embed the taxonomy_cache versions of the collections a response is
+# built from, so this worker's writes make old entries unreachable; the TTL bounds writes made by other workers.
+_response_cache = TTLCache(maxsize=1024, ttl=TAXONOMY_CACHE_TTL)
+
+async def cached_json_response(key: Tuple, build) -> Response:
+    """Serve the JSON body cached under key, building and caching it with `await build()` on a miss."""
+    body = _response_cache.get(key)
+    if body is None:
+        body = orjson.dumps(await build())
+        _response_cache[key] = body
+    return Response(content=body, media_type="application/json")
+
 # Auth helpers
+def _is_bcrypt_hash(hashed: str) -> bool:
+    return hashed.startswith("$2")
+
 def hash_password(password: str) -> str:
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+    return _password_hasher.hash(password)
 
 def verify_password(password: str, hashed: str) -> bool:
-    return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+    if _is_bcrypt_hash(hashed):
+        return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+    try:
+        return _password_hasher.verify(hashed, password)
+    except (VerificationError, InvalidHashError):
+        return False
+
+def password_needs_rehash(hashed: str) -> bool:
+    return _is_bcrypt_hash(hashed) or _password_hasher.check_needs_rehash(hashed)
+
+# Async variants run the KDF on the dedicated hashing pool so it never blocks the event loop
+async def hash_password_async(password: str) -> str:
+    return await asyncio.get_running_loop().run_in_executor(_password_hash_executor, hash_password, password)
+
+async def verify_password_async(password: str, hashed: str) -> bool:
+    return await asyncio.get_running_loop().run_in_executor(_password_hash_executor, verify_password, password, hashed)
+
+# Verified against when the login email is unknown, to keep the response timing uniform. bcrypt and argon2 take
+# different times, so the dummy follows whichever scheme most stored hashes still use while logins migrate them;
+# gensalt()'s default cost matches the legacy bcrypt hashes.
+_DUMMY_HASHES = {
+    "argon2": hash_password("dummy-password"),
+    "bcrypt": bcrypt.hashpw(b"dummy-password", bcrypt.gensalt()).decode('utf-8'),
+}
+_DUMMY_HASH = _DUMMY_HASHES["bcrypt"]
+
+async def refresh_dummy_hash():
+    global _DUMMY_HASH
+    total, legacy = await asyncio.gather(
+        db.users.count_documents({}),
+        db.users.count_documents({"password_hash": {"$regex": "^\\$2"}})
+    )
+    _DUMMY_HASH = _DUMMY_HASHES["bcrypt" if legacy * 2 > total else "argon2"]
+
+# Hashes of the sample-data passwords, computed once so init-data doesn't hash on the event loop
+_DEFAULT_ADMIN_HASH = hash_password("admin123")
+_DEFAULT_USER_HASH = hash_password("user123")
+
+def create_token(user_id: str, role: str, email: str) -> str:
+    # The claims carry everything request handling needs, so authenticated requests don't load the user
+    now = datetime.now(timezone.utc)
+    payload = {
+        "user_id": user_id,
+        "role": role,
+        "email": email,
+        "iat": now,
+        # iat is whole seconds; revocation checks need the exact issue time to tell tokens issued in the same
+        # second apart
+        "issued_at": now.timestamp(),
+        "exp": now + timedelta(hours=JWT_EXPIRATION_HOURS)
+    }
+    return jwt.encode(payload, _JWT_KEY, algorithm=JWT_ALGORITHM)
 
-def create_token(user_id: str, role: str) -> str:
-    payload = {"user_id": user_id, "role": role}
-    return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
+# Verified claims keyed by the raw token, so repeat requests skip the signature check. Revocation is still
+# checked on every request by the caller; expiry is re-checked here on each hit.
+_token_cache = TTLCache(maxsize=10000, ttl=60)
 
-async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
-    try:
-        payload = jwt.decode(credentials.credentials, JWT_SECRET, algorithms=[JWT_ALGORITHM])
-        user_id = payload.get("user_id")
-        if not user_id:
+def decode_token(token: str) -> Dict[str, Any]:
+    payload = _token_cache.get(token)
+    if payload is not None:
+        if payload["exp"] <= time.time():
+            _token_cache.pop(token, None)
             raise HTTPException(status_code=401, detail="Invalid token")
-        
-        user = await db.users.find_one({"id": user_id})
-        if not user:
-            raise HTTPException(status_code=401, detail="User not found")
-        
-        if user.get("status") == "blocked":
-            raise HTTPException(status_code=403, detail="Account blocked")
-            
-        return User(**user)
+        return payload
+    
+    try:
+        payload = jwt.decode(
+            token,
+            _JWT_KEY,
+            algorithms=[JWT_ALGORITHM],
+            options={"verify_exp": True, "require": ["user_id", "iat", "exp"]}
+        )
     except jwt.PyJWTError:
         raise HTTPException(status_code=401, detail="Invalid token")
+    
+    if not payload.get("user_id"):
+        raise HTTPException(status_code=401, detail="Invalid token")
+    _token_cache[token] = payload
+    return payload
+
+# Token revocation list - tokens issued to a user before their revocation time are rejected. Entries live in
+# Mongo so every worker sees them; each worker keeps the whole (small) list in memory and re-reads it every
+# AUTH_CACHE_TTL seconds. The "*" entry revokes every token, e.g. after clear-data.
+class RevocationList:
+    def __init__(self, refresh_interval: int = 30):
+        self._refresh_interval = refresh_interval
+        self._revoked: Dict[str, Dict[str, Any]] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+    
+    async def _refresh(self):
+        async with self._lock:
+            if self._loaded_at is not None and time.monotonic() - self._loaded_at < self._refresh_interval:
+                return
+            rows = await db.token_revocations.find({}, {"_id": 0, "user_id": 1, "revoked_at": 1, "reason": 1}).to_list(length=None)
+            # Merge rather than replace, so an entry revoke() added while the query ran isn't lost
+            for row in rows:
+                entry = self._revoked.get(row["user_id"])
+                if entry is None or row["revoked_at"] >= entry["revoked_at"]:
+                    self._revoked[row["user_id"]] = row
+            self._loaded_at = time.monotonic()
+    
+    async def check(self, payload: Dict[str, Any]):
+        """Raise if the token was issued before its user's (or a global) revocation."""
+        if self._loaded_at is None or time.monotonic() - self._loaded_at >= self._refresh_interval:
+            await self._refresh()
+        
+        # Tokens from before the issued_at claim only carry whole-second iat and are compared at that precision
+        issued_at = payload.get("issued_at", payload["iat"])
+        for key in (payload["user_id"], "*"):
+            entry = self._revoked.get(key)
+            if entry is not None and issued_at < entry["revoked_at"]:
+                if entry.get("reason") == "blocked":
+                    raise HTTPException(status_code=403, detail="Account blocked")
+                raise HTTPException(status_code=401, detail="Token revoked")
+    
+    async def revoke(self, user_id: str, reason: str):
+        entry = {
+            "user_id": user_id,
+            "revoked_at": time.time(),
+            "reason": reason,
+            # Once every token issued before revoked_at has expired the entry can go (TTL index)
+            "expires_at": datetime.now(timezone.utc) + timedelta(hours=JWT_EXPIRATION_HOURS)
+        }
+        await db.token_revocations.replace_one({"user_id": user_id}, entry, upsert=True)
+        self._revoked[user_id] = entry
+    
+    def expire(self):
+        """Force a re-read on the next check, e.g. when another worker revoked a token."""
+        self._loaded_at = None
+
+revocation_list = RevocationList(refresh_interval=AUTH_CACHE_TTL)
+
+async def user_from_claims(payload: Dict[str, Any]) -> User:
+    await revocation_list.check(payload)
+    # Handlers only rely on id, role and status; blocking a user revokes their tokens, so a valid token means active
+    return User.model_construct(
+        id=payload["user_id"],
+        role=payload.get("role", "user"),
+        email=payload.get("email", ""),
+        status="active"
+    )
+
+async def get_current_user(request: Request, credentials: HTTPAuthorizationCredentials = Depends(security)) -> User:
+    # The resolved user is memoized on the request so chained dependencies reuse it
+    current_user = getattr(request.state, "user", None)
+    if current_user is None:
+        current_user = await user_from_claims(decode_token(credentials.credentials))
+        request.state.user = current_user
+    return current_user
+
+async def require_admin(request: Request, credentials: HTTPAuthorizationCredentials = Depends(security)) -> User:
+    current_user = getattr(request.state, "user", None)
+    if current_user is None:
+        payload = decode_token(credentials.credentials)
+        # Role changes revoke the user's tokens, so the role claim can be trusted
+        if payload.get("role") != "admin":
+            raise HTTPException(status_code=403, detail="Admin access required")
+        
+        current_user = await user_from_claims(payload)
+        request.state.user = current_user
+    
+    if current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+    return current_user
+
+# Pagination defaults for admin list endpoints
+ADMIN_PAGE_SIZE = 100
+ADMIN_MAX_PAGE_SIZE = 1000
+# Largest page a user may request from their own assessment history
+ASSESSMENTS_MAX_PAGE_SIZE = 200
+
+# Response helpers
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """Return a 304 response when the client's cached copy still matches etag."""
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return None
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+def stream_json_array(cursor, etag: Optional[str] = None) -> StreamingResponse:
+    """Stream a Mongo cursor as a JSON array without materializing the full result list."""
+    async def generate():
+        buffer = bytearray(b"[")
+        separator = b""
+        async for doc in cursor:
+            buffer += separator
+            buffer += orjson.dumps(doc)
+            separator = b","
+            if len(buffer) >= STREAM_CHUNK_SIZE:
+                yield bytes(buffer)
+                buffer.clear()
+        buffer += b"]"
+        yield bytes(buffer)
+    
+    # Clients keep ETagged listings but must revalidate them, which is answered with a 304 while unchanged
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"} if etag else None
+    return StreamingResponse(generate(), media_type="application/json", headers=headers)
 
 # Basic endpoint
 @api_router.get("/")
@@ -161,34 +496,43 @@ async def root():
 # Auth endpoints
 @api_router.post("/auth/register")
 async def register_user(user_data: UserCreate):
-    # Check if user already exists
-    existing_user = await db.users.find_one({"email": user_data.email})
-    if existing_user:
-        raise HTTPException(status_code=400, detail="Email already registered")
-    
-    # Create new user
-    user_dict = user_data.dict()
-    user_dict["password_hash"] = hash_password(user_dict.pop("password"))
+    # Create new user - duplicate emails are rejected by the unique index on users.email
+    user_dict = user_data.model_dump()
+    user_dict["password_hash"] = await hash_password_async(user_dict.pop("password"))
     user = User(**user_dict)
     
-    await db.users.insert_one(user.dict())
+    try:
+        await db.users.insert_one(user.model_dump())
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="Email already registered")
     
-    token = create_token(user.id, user.role)
+    token = create_token(user.id, user.role, user.email)
     return {"token": token, "user": {"id": user.id, "email": user.email, "role": user.role}}
 
 @api_router.post("/auth/login")
 async def login_user(login_data: UserLogin):
-    user = await db.users.find_one({"email": login_data.email})
-    if not user:
+    user = await db.users.find_one(
+        {"email": login_data.email},
+        {"_id": 0, "id": 1, "email": 1, "role": 1, "status": 1, "password_hash": 1}
+    )
+    
+    # Always run a password verify so unknown emails take as long as wrong passwords
+    password_ok = await verify_password_async(login_data.password, user["password_hash"] if user else _DUMMY_HASH)
+    if not hmac.compare_digest(bytes([user is not None and password_ok]), b"\x01"):
         raise HTTPException(status_code=401, detail="Invalid credentials")
     
     if user.get("status") == "blocked":
         raise HTTPException(status_code=403, detail="Account blocked")
     
-    if not verify_password(login_data.password, user["password_hash"]):
-        raise HTTPException(status_code=401, detail="Invalid credentials")
+    # Upgrade bcrypt or outdated argon2 hashes while the plaintext is at hand. Matching on the old hash keeps a
+    # concurrent password change from being overwritten; tokens aren't revoked since the password is the same.
+    if password_needs_rehash(user["password_hash"]):
+        await db.users.update_one(
+            {"id": user["id"], "password_hash": user["password_hash"]},
+            {"$set": {"password_hash": await hash_password_async(login_data.password)}}
+        )
     
-    token = create_token(user["id"], user["role"])
+    token = create_token(user["id"], user["role"], user["email"])
     return {"token": token, "user": {"id": user["id"], "email": user["email"], "role": user["role"]}}
 
 @api_router.post("/auth/forgot-password")
@@ -200,7 +544,7 @@ async def forgot_password(email_data: dict):
     # 3. Send email with reset link
     # 4. Store the token with expiry
     
-    user = await db.users.find_one({"email": email_data["email"]})
+    user = await db.users.find_one({"email": email_data["email"]}, {"_id": 1})
     if not user:
         # Don't reveal if email exists or not for security
         return {"message": "If the email exists, a reset link has been sent"}
@@ -211,70 +555,85 @@ async def forgot_password(email_data: dict):
 # Assessment endpoints
 @api_router.get("/domains", response_model=List[Domain])
 async def get_domains():
-    domains = await db.domains.find().sort("order", 1).to_list(length=None)
-    return [Domain(**domain) for domain in domains]
+    # Cached documents were validated as Domain on write; returning the response directly skips
+    # re-validating them against response_model and the jsonable_encoder pass
+    return await cached_json_response(
+        ("domains", taxonomy_cache.version("domains")),
+        lambda: taxonomy_cache.get("domains")
+    )
 
 @api_router.get("/domains/{domain_id}/questions")
 async def get_domain_questions(domain_id: str):
-    # Get all questions for the domain
-    questions = await db.questions.find({"domain_id": domain_id}).to_list(length=None)
-    
-    # Get related data for each question
-    result = []
+    # Only known domains get a cache entry, so requests for arbitrary ids can't evict the useful ones
+    if domain_id not in await taxonomy_cache.get_map("domains"):
+        return ORJSONResponse(await build_domain_questions(domain_id))
+    return await cached_json_response(
+        ("domain_questions", domain_id, *(taxonomy_cache.version(name) for name in ("questions", "subdomains", "controls", "metrics"))),
+        lambda: build_domain_questions(domain_id)
+    )
+
+async def build_domain_questions(domain_id: str) -> List[Dict[str, Any]]:
+    # Subdomain, control and metric names come from the in-process taxonomy cache, so this is one indexed query
+    questions, subdomains_by_id, controls_by_id, metrics_by_id = await asyncio.gather(
+        db.questions.find(
+            {"domain_id": domain_id},
+            {"_id": 0, "id": 1, "question_text": 1, "answers": 1, "domain_id": 1, "subdomain_id": 1, "control_id": 1, "metric_id": 1}
+        ).to_list(length=None),
+        taxonomy_cache.get_map("subdomains"),
+        taxonomy_cache.get_map("controls"),
+        taxonomy_cache.get_map("metrics")
+    )
+    
+    no_doc = {}
     for question in questions:
-        # Get subdomain, control, metric info
-        subdomain = await db.subdomains.find_one({"id": question["subdomain_id"]})
-        control = await db.controls.find_one({"id": question["control_id"]})
-        metric = await db.metrics.find_one({"id": question["metric_id"]})
-        
-        question_data = {
-            "id": question["id"],
-            "question_text": question["question_text"],
-            "answers": question["answers"],
-            "subdomain": subdomain["name"] if subdomain else "",
-            "control": {
-                "name": control["name"] if control else "",
-                "definition": control["definition"] if control else ""
-            },
-            "metric": metric["name"] if metric else "",
-            "domain_id": question["domain_id"],
-            "subdomain_id": question["subdomain_id"],
-            "control_id": question["control_id"],
-            "metric_id": question["metric_id"]
-        }
-        result.append(question_data)
-    
-    return result
+        subdomain = subdomains_by_id.get(question.get("subdomain_id"), no_doc)
+        control = controls_by_id.get(question.get("control_id"), no_doc)
+        metric = metrics_by_id.get(question.get("metric_id"), no_doc)
+        question["subdomain"] = subdomain.get("name", "")
+        question["control"] = {"name": control.get("name", ""), "definition": control.get("definition", "")}
+        question["metric"] = metric.get("name", "")
+    return questions
 
 @api_router.post("/assessments/submit")
 async def submit_assessment(submission: AssessmentSubmission, current_user: User = Depends(get_current_user)):
-    # Create assessment record
-    assessment = UserAssessment(user_id=current_user.id)
-    await db.user_assessments.insert_one(assessment.dict())
+    # Create assessment record; the header and every response share one timestamp
+    now = datetime.now(timezone.utc)
+    assessment = UserAssessment(user_id=current_user.id, submission_date=now)
+    
+    # Fetch all referenced questions in one query
+    question_ids = [response_data["question_id"] for response_data in submission.responses]
+    questions = await db.questions.find(
+        {"id": {"$in": question_ids}},
+        {"_id": 0, "id": 1, "answers.id": 1, "answers.score_value": 1, "domain_id": 1, "subdomain_id": 1, "control_id": 1, "metric_id": 1}
+    ).to_list(length=None)
+    question_map = {q["id"]: q for q in questions}
+    # Answers stored without an id (older admin edits) can't be selected, so they're skipped rather than failing
+    answer_map = {(q["id"], a["id"]): a for q in questions for a in q.get("answers", []) if "id" in a}
+    
+    # Resolve domain and control names so they can be stored on each response
+    domains_by_id = await taxonomy_cache.get_map("domains")
+    controls_by_id = await taxonomy_cache.get_map("controls")
+    domain_name_map = {domain_id: d["name"] for domain_id, d in domains_by_id.items()}
+    control_name_map = {control_id: c["name"] for control_id, c in controls_by_id.items()}
     
     # Process each response
     response_records = []
-    for response_data in submission.responses:
+    response_ids = _uids(len(submission.responses))
+    for response_id, response_data in zip(response_ids, submission.responses):
         question_id = response_data["question_id"]
         selected_answer_id = response_data["selected_answer_id"]
         
-        # Get question details
-        question = await db.questions.find_one({"id": question_id})
+        question = question_map.get(question_id)
         if not question:
             continue
             
-        # Find the selected answer and its score
-        selected_answer = None
-        for answer in question["answers"]:
-            if answer["id"] == selected_answer_id:
-                selected_answer = answer
-                break
-        
+        selected_answer = answer_map.get((question_id, selected_answer_id))
         if not selected_answer:
             continue
             
         # Create response record
         user_response = UserResponse(
+            id=response_id,
             assessment_id=assessment.id,
             user_id=current_user.id,
             question_id=question_id,
@@ -283,99 +642,152 @@ async def submit_assessment(submission: AssessmentSubmission, current_user: User
             subdomain_id=question["subdomain_id"],
             control_id=question["control_id"],
             metric_id=question["metric_id"],
-            score_value=selected_answer["score_value"]
+            score_value=selected_answer["score_value"],
+            domain_name=domain_name_map.get(question["domain_id"]),
+            control_name=control_name_map.get(question["control_id"]),
+            created_at=now
         )
         
-        response_records.append(user_response.dict())
+        response_records.append(user_response.model_dump())
     
-    # Bulk insert all responses
+    # The header and the responses live in different collections, so both writes go out together
+    writes = [db.user_assessments.insert_one(assessment.model_dump())]
     if response_records:
-        await db.user_responses.insert_many(response_records)
+        writes.append(db.user_responses.insert_many(response_records, ordered=False))
+    await asyncio.gather(*writes)
     
     return {"assessment_id": assessment.id, "message": "Assessment submitted successfully"}
 
 @api_router.get("/assessments/my-assessments")
-async def get_user_assessments(current_user: User = Depends(get_current_user)):
-    assessments = await db.user_assessments.find({"user_id": current_user.id}).sort("submission_date", -1).to_list(length=None)
-    return [UserAssessment(**assessment) for assessment in assessments]
+async def get_user_assessments(
+    limit: Optional[int] = Query(None, ge=1, le=ASSESSMENTS_MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    current_user: User = Depends(get_current_user)
+):
+    # Keyset pagination on the (user_id, submission_date, id) index - id breaks ties between equal timestamps.
+    # A full page carries an X-Next-Cursor header to pass back as `cursor`. Without `limit` the full history is
+    # streamed, as the dashboard expects.
+    query: Dict[str, Any] = {"user_id": current_user.id}
+    if cursor is not None:
+        before_date, before_id = decode_assessment_cursor(cursor)
+        query["$or"] = [
+            {"submission_date": {"$lt": before_date}},
+            {"submission_date": before_date, "id": {"$lt": before_id}}
+        ]
+    find_cursor = db.user_assessments.find(
+        query,
+        {"_id": 0, "id": 1, "user_id": 1, "submission_date": 1, "status": 1}
+    ).sort([("submission_date", -1), ("id", -1)]).batch_size(500)
+    if limit is None:
+        return stream_json_array(find_cursor)
+    
+    page = await find_cursor.limit(limit).to_list(length=limit)
+    headers = {}
+    if len(page) == limit:
+        headers["X-Next-Cursor"] = encode_assessment_cursor(page[-1])
+    return ORJSONResponse(page, headers=headers)
+
+def encode_assessment_cursor(assessment: Dict[str, Any]) -> str:
+    raw = orjson.dumps([assessment["submission_date"].isoformat(), assessment["id"]])
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+def decode_assessment_cursor(cursor: str) -> Tuple[datetime, str]:
+    try:
+        submission_date, assessment_id = orjson.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return datetime.fromisoformat(submission_date), str(assessment_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
 
 # Dashboard endpoints  
 @api_router.get("/dashboard/stats/{assessment_id}")
 async def get_assessment_stats(assessment_id: str, current_user: User = Depends(get_current_user)):
+    # Submitted responses never change, so only the fallback name lookups can make a cached result stale
+    return await cached_json_response(
+        ("assessment_stats", assessment_id, current_user.id, taxonomy_cache.version("domains"), taxonomy_cache.version("controls")),
+        lambda: build_assessment_stats(assessment_id, current_user.id)
+    )
+
+async def build_assessment_stats(assessment_id: str, user_id: str) -> Dict[str, Any]:
     # Verify assessment belongs to user
-    assessment = await db.user_assessments.find_one({"id": assessment_id, "user_id": current_user.id})
+    assessment = await db.user_assessments.find_one({"id": assessment_id, "user_id": user_id}, {"_id": 0, "submission_date": 1})
     if not assessment:
         raise HTTPException(status_code=404, detail="Assessment not found")
     
-    # Get all responses for this assessment
-    responses = await db.user_responses.find({"assessment_id": assessment_id}).to_list(length=None)
+    # Aggregate scores for this assessment server-side
+    pipeline = [
+        {"$match": {"assessment_id": assessment_id}},
+        {"$facet": {
+            "totals": [
+                {"$group": {"_id": None, "total": {"$sum": "$score_value"}, "count": {"$sum": 1}}}
+            ],
+            "domains": [
+                {"$group": {
+                    "_id": "$domain_id",
+                    "domain_name": {"$first": "$domain_name"},
+                    "total": {"$sum": "$score_value"},
+                    "count": {"$sum": 1},
+                    "first_seen": {"$min": "$_id"}
+                }},
+                {"$sort": {"first_seen": 1}}
+            ],
+            "controls": [
+                {"$group": {
+                    "_id": {"domain_id": "$domain_id", "control_id": "$control_id"},
+                    "domain_name": {"$first": "$domain_name"},
+                    "control_name": {"$first": "$control_name"},
+                    "total": {"$sum": "$score_value"},
+                    "count": {"$sum": 1},
+                    "first_seen": {"$min": "$_id"}
+                }},
+                {"$sort": {"first_seen": 1}}
+            ]
+        }}
+    ]
+    facets = (await (await db.user_responses.aggregate(pipeline)).to_list(length=1))[0]
     
-    if not responses:
+    if not facets["totals"]:
         return {"total_responses": 0, "domains_completed": 0, "overall_average": 0, "domain_scores": [], "control_performance": []}
     
     # Calculate basic stats
-    total_responses = len(responses)
-    total_score = sum(response["score_value"] for response in responses)
-    overall_average = round(total_score / total_responses, 2) if total_responses > 0 else 0
-    
-    # Get unique domains completed
-    unique_domains = set(response["domain_id"] for response in responses)
-    domains_completed = len(unique_domains)
-    
-    # Calculate domain-wise scores
-    domain_scores = {}
-    control_performance = {}
-    
-    for response in responses:
-        domain_id = response["domain_id"]
-        control_id = response["control_id"]
-        score = response["score_value"]
-        
-        # Domain scores
-        if domain_id not in domain_scores:
-            domain_scores[domain_id] = {"scores": [], "total": 0, "count": 0}
-        domain_scores[domain_id]["scores"].append(score)
-        domain_scores[domain_id]["total"] += score
-        domain_scores[domain_id]["count"] += 1
-        
-        # Control performance
-        if control_id not in control_performance:
-            control_performance[control_id] = {"scores": [], "total": 0, "count": 0, "domain_id": domain_id}
-        control_performance[control_id]["scores"].append(score)
-        control_performance[control_id]["total"] += score
-        control_performance[control_id]["count"] += 1
-    
-    # Get domain names
-    domains = await db.domains.find().to_list(length=None)
-    domain_name_map = {d["id"]: d["name"] for d in domains}
-    
-    # Get control names  
-    controls = await db.controls.find().to_list(length=None)
-    control_name_map = {c["id"]: c["name"] for c in controls}
+    totals = facets["totals"][0]
+    total_responses = totals["count"]
+    overall_average = round(totals["total"] / total_responses, 2) if total_responses > 0 else 0
+    domains_completed = len(facets["domains"])
+    
+    # Names are stored on each response; only responses recorded before that need a lookup
+    domain_name_map = {row["_id"]: row["domain_name"] for row in facets["domains"] if row.get("domain_name")}
+    control_name_map = {row["_id"]["control_id"]: row["control_name"] for row in facets["controls"] if row.get("control_name")}
+    if any(row["_id"] not in domain_name_map for row in facets["domains"]):
+        domains_by_id = await taxonomy_cache.get_map("domains")
+        domain_name_map = {**{domain_id: d["name"] for domain_id, d in domains_by_id.items()}, **domain_name_map}
+    if any(row["_id"]["control_id"] not in control_name_map for row in facets["controls"]):
+        controls_by_id = await taxonomy_cache.get_map("controls")
+        control_name_map = {**{control_id: c["name"] for control_id, c in controls_by_id.items()}, **control_name_map}
     
     # Format domain scores with names and averages
     domain_stats = []
-    for domain_id, data in domain_scores.items():
-        avg_score = round(data["total"] / data["count"], 2)
+    for row in facets["domains"]:
+        domain_id = row["_id"]
         domain_stats.append({
             "domain_id": domain_id,
             "domain_name": domain_name_map.get(domain_id, "Unknown"),
-            "average_score": avg_score,
-            "total_questions": data["count"],
-            "total_score": data["total"]
+            "average_score": round(row["total"] / row["count"], 2),
+            "total_questions": row["count"],
+            "total_score": row["total"]
         })
     
     # Format control performance
     control_stats = []
-    for control_id, data in control_performance.items():
-        avg_score = round(data["total"] / data["count"], 2)
+    for row in facets["controls"]:
+        domain_id = row["_id"]["domain_id"]
+        control_id = row["_id"]["control_id"]
         control_stats.append({
             "control_id": control_id,
             "control_name": control_name_map.get(control_id, "Unknown"),
-            "domain_id": data["domain_id"],
-            "domain_name": domain_name_map.get(data["domain_id"], "Unknown"),
-            "average_score": avg_score,
-            "total_questions": data["count"]
+            "domain_id": domain_id,
+            "domain_name": domain_name_map.get(domain_id, "Unknown"),
+            "average_score": round(row["total"] / row["count"], 2),
+            "total_questions": row["count"]
         })
     
     # Find top strengths and focus areas
@@ -396,130 +808,134 @@ async def get_assessment_stats(assessment_id: str, current_user: User = Depends(
 
 # Admin User Management Endpoints
 @api_router.get("/admin/users")
-async def get_all_users(current_user: User = Depends(get_current_user)):
-    if current_user.role != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-    
-    users = await db.users.find().to_list(length=None)
-    # Remove MongoDB _id field to avoid serialization issues
-    for user in users:
-        user.pop('_id', None)
-    return users
+async def get_all_users(current_user: User = Depends(require_admin)):
+    return stream_json_array(db.users.find({}, {"_id": 0, "password_hash": 0}).batch_size(500))
 
 @api_router.post("/admin/users")
-async def create_user_by_admin(user_data: dict, current_user: User = Depends(get_current_user)):
-    if current_user.role != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-    
-    # Check if user already exists
-    existing_user = await db.users.find_one({"email": user_data["email"]})
-    if existing_user:
-        raise HTTPException(status_code=400, detail="Email already registered")
-    
-    # Create user
+async def create_user_by_admin(user_data: dict, current_user: User = Depends(require_admin)):
+    # Create user - duplicate emails are rejected by the unique index on users.email
     user_dict = user_data.copy()
-    user_dict["password_hash"] = hash_password(user_dict.pop("password"))
-    user_dict["id"] = str(uuid.uuid4())
+    user_dict["password_hash"] = await hash_password_async(user_dict.pop("password"))
+    user_dict["id"] = _uid()
     user = User(**user_dict)
     
-    await db.users.insert_one(user.dict())
-    return {"message": f"{user_data.get('role', 'user').title()} created successfully", "user": user.dict()}
+    try:
+        await db.users.insert_one(user.model_dump())
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="Email already registered")
+    return {"message": f"{user_data.get('role', 'user').title()} created successfully", "user": user.model_dump(exclude={"password_hash"})}
 
 @api_router.put("/admin/users/{user_id}")
-async def update_user_by_admin(user_id: str, updates: dict, current_user: User = Depends(get_current_user)):
-    if current_user.role != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-    
+async def update_user_by_admin(user_id: str, updates: dict, current_user: User = Depends(require_admin)):
     if "password" in updates:
-        updates["password_hash"] = hash_password(updates.pop("password"))
+        updates["password_hash"] = await hash_password_async(updates.pop("password"))
     
-    result = await db.users.update_one({"id": user_id}, {"$set": updates})
+    try:
+        result = await db.users.update_one({"id": user_id}, {"$set": updates})
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="Email already registered")
     if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="User not found")
     
+    # Tokens carry role and imply an active account, so changing either (or the credentials) revokes them
+    if updates.get("status") == "blocked":
+        await revocation_list.revoke(user_id, "blocked")
+    elif {"role", "email", "password_hash"} & updates.keys():
+        await revocation_list.revoke(user_id, "updated")
     return {"message": "User updated successfully"}
 
 @api_router.delete("/admin/users/{user_id}")
-async def delete_user_by_admin(user_id: str, current_user: User = Depends(get_current_user)):
-    if current_user.role != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-    
+async def delete_user_by_admin(user_id: str, current_user: User = Depends(require_admin)):
     result = await db.users.delete_one({"id": user_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="User not found")
     
+    await revocation_list.revoke(user_id, "deleted")
     return {"message": "User deleted successfully"}
 
 # Admin Statistics
 @api_router.get("/admin/platform-stats")
-async def get_platform_stats(current_user: User = Depends(get_current_user)):
-    if current_user.role != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-    
-    # User statistics
-    total_users = await db.users.count_documents({})
-    admin_users = await db.users.count_documents({"role": "admin"})
-    regular_users = await db.users.count_documents({"role": "user"})
-    active_users = await db.users.count_documents({"status": "active"})
-    blocked_users = await db.users.count_documents({"status": "blocked"})
-    
-    # Assessment statistics
-    total_assessments = await db.user_assessments.count_documents({})
-    total_responses = await db.user_responses.count_documents({})
-    
-    # Calculate overall scoring trends
-    all_responses = await db.user_responses.find().to_list(length=None)
-    overall_avg_score = 0
-    domain_scores = {}
-    
-    if all_responses:
-        total_score = sum(r["score_value"] for r in all_responses)
-        overall_avg_score = round(total_score / len(all_responses), 2)
-        
-        # Calculate domain-wise averages
-        for response in all_responses:
-            domain_id = response["domain_id"]
-            if domain_id not in domain_scores:
-                domain_scores[domain_id] = {"total": 0, "count": 0}
-            domain_scores[domain_id]["total"] += response["score_value"]
-            domain_scores[domain_id]["count"] += 1
+async def get_platform_stats(current_user: User = Depends(require_admin)):
+    # User and assessment statistics
+    (
+        total_users, admin_users, regular_users, active_users, blocked_users,
+        total_assessments, score_cursor
+    ) = await asyncio.gather(
+        db.users.count_documents({}),
+        db.users.count_documents({"role": "admin"}),
+        db.users.count_documents({"role": "user"}),
+        db.users.count_documents({"status": "active"}),
+        db.users.count_documents({"status": "blocked"}),
+        db.user_assessments.count_documents({}),
+        # Overall scoring trends, aggregated server-side
+        db.user_responses.aggregate([
+            {"$facet": {
+                "totals": [
+                    {"$group": {"_id": None, "total": {"$sum": "$score_value"}, "count": {"$sum": 1}}}
+                ],
+                "domains": [
+                    {"$group": {
+                        "_id": "$domain_id",
+                        "total": {"$sum": "$score_value"},
+                        "count": {"$sum": 1},
+                        "first_seen": {"$min": "$_id"}
+                    }},
+                    {"$sort": {"first_seen": 1}}
+                ]
+            }}
+        ])
+    )
+    facets = (await score_cursor.to_list(length=1))[0]
+    totals = facets["totals"][0] if facets["totals"] else {"total": 0, "count": 0}
+    total_responses = totals["count"]
+    overall_avg_score = round(totals["total"] / total_responses, 2) if total_responses > 0 else 0
     
     # Get domain names and calculate averages
-    domains = await db.domains.find().to_list(length=None)
-    domain_name_map = {d["id"]: d["name"] for d in domains}
+    domains_by_id = await taxonomy_cache.get_map("domains")
     
     scoring_trends = []
-    for domain_id, data in domain_scores.items():
-        avg = round(data["total"] / data["count"], 2) if data["count"] > 0 else 0
+    for row in facets["domains"]:
+        domain = domains_by_id.get(row["_id"])
         scoring_trends.append({
-            "domain_name": domain_name_map.get(domain_id, "Unknown"),
-            "average_score": avg,
-            "total_responses": data["count"]
+            "domain_name": domain["name"] if domain else "Unknown",
+            "average_score": round(row["total"] / row["count"], 2) if row["count"] > 0 else 0,
+            "total_responses": row["count"]
         })
     
     # Get recent assessments with user details
-    recent_assessments = await db.user_assessments.find().sort("submission_date", -1).limit(10).to_list(length=10)
+    recent_assessments = await db.user_assessments.find({}, {"_id": 0}).sort("submission_date", -1).limit(10).to_list(length=10)
+    recent_user_ids = list({assessment["user_id"] for assessment in recent_assessments})
+    recent_users = await db.users.find(
+        {"id": {"$in": recent_user_ids}},
+        {"_id": 0, "id": 1, "first_name": 1, "last_name": 1, "email": 1}
+    ).to_list(length=None)
+    recent_user_map = {u["id"]: u for u in recent_users}
     for assessment in recent_assessments:
-        assessment.pop('_id', None)  # Remove MongoDB _id
-        user = await db.users.find_one({"id": assessment["user_id"]})
+        user = recent_user_map.get(assessment["user_id"])
         assessment["user_name"] = f"{user['first_name']} {user['last_name']}" if user else "Unknown"
         assessment["user_email"] = user["email"] if user else "Unknown"
     
-    # User assessment activity
+    # User assessment activity - per-user counts and latest dates computed server-side
+    activity_rows = await (await db.user_assessments.aggregate([
+        {"$group": {"_id": "$user_id", "count": {"$sum": 1}, "latest": {"$max": "$submission_date"}}}
+    ])).to_list(length=None)
+    activity_map = {row["_id"]: row for row in activity_rows}
+    
     user_activities = []
-    users = await db.users.find({"role": "user"}).to_list(length=None)
+    users = await db.users.find(
+        {"role": "user"},
+        {"_id": 0, "id": 1, "first_name": 1, "last_name": 1, "email": 1, "organization_name": 1, "status": 1}
+    ).to_list(length=None)
     for user in users:
-        user.pop('_id', None)  # Remove MongoDB _id
-        assessment_count = await db.user_assessments.count_documents({"user_id": user["id"]})
-        latest_assessment = await db.user_assessments.find_one({"user_id": user["id"]}, sort=[("submission_date", -1)])
+        activity = activity_map.get(user["id"])
         
         user_activities.append({
             "user_id": user["id"],
             "name": f"{user['first_name']} {user['last_name']}",
             "email": user["email"],
             "organization": user["organization_name"],
-            "assessment_count": assessment_count,
-            "latest_assessment": latest_assessment["submission_date"] if latest_assessment else None,
+            "assessment_count": activity["count"] if activity else 0,
+            "latest_assessment": activity["latest"] if activity else None,
             "status": user.get("status", "active")
         })
     
@@ -544,22 +960,15 @@ async def get_platform_stats(current_user: User = Depends(get_current_user)):
 
 # Admin User-Specific Dashboard View
 @api_router.get("/admin/user-dashboard/{user_id}")
-async def get_user_dashboard_for_admin(user_id: str, current_user: User = Depends(get_current_user)):
-    if current_user.role != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-    
-    # Get user details
-    target_user = await db.users.find_one({"id": user_id})
+async def get_user_dashboard_for_admin(user_id: str, current_user: User = Depends(require_admin)):
+    # Get user details and the user's assessments
+    target_user, assessments = await asyncio.gather(
+        db.users.find_one({"id": user_id}, {"_id": 0, "password_hash": 0}),
+        db.user_assessments.find({"user_id": user_id}, {"_id": 0}).sort("submission_date", -1).to_list(length=None)
+    )
     if not target_user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    target_user.pop('_id', None)  # Remove MongoDB _id
-    
-    # Get user's assessments
-    assessments = await db.user_assessments.find({"user_id": user_id}).sort("submission_date", -1).to_list(length=None)
-    for assessment in assessments:
-        assessment.pop('_id', None)  # Remove MongoDB _id
-    
     if not assessments:
         return {
             "user": target_user,
@@ -570,41 +979,42 @@ async def get_user_dashboard_for_admin(user_id: str, current_user: User = Depend
     
     # Get stats for latest assessment
     latest_assessment = assessments[0]
-    responses = await db.user_responses.find({"assessment_id": latest_assessment["id"]}).to_list(length=None)
-    
-    if not responses:
+    # Per-domain totals are grouped server-side; overall figures are summed from those few rows
+    domain_rows = await (await db.user_responses.aggregate([
+        {"$match": {"assessment_id": latest_assessment["id"]}},
+        {"$group": {
+            "_id": "$domain_id",
+            "domain_name": {"$first": "$domain_name"},
+            "total": {"$sum": "$score_value"},
+            "count": {"$sum": 1},
+            "first_seen": {"$min": "$_id"}
+        }},
+        {"$sort": {"first_seen": 1}}
+    ])).to_list(length=None)
+    
+    if not domain_rows:
         stats = {"total_responses": 0, "domains_completed": 0, "overall_average": 0, "domain_scores": []}
     else:
         # Calculate comprehensive stats
-        total_responses = len(responses)
-        total_score = sum(response["score_value"] for response in responses)
+        total_responses = sum(row["count"] for row in domain_rows)
+        total_score = sum(row["total"] for row in domain_rows)
         overall_average = round(total_score / total_responses, 2) if total_responses > 0 else 0
-        unique_domains = set(response["domain_id"] for response in responses)
-        domains_completed = len(unique_domains)
-        
-        # Calculate domain-wise scores
-        domain_scores = {}
-        for response in responses:
-            domain_id = response["domain_id"]
-            if domain_id not in domain_scores:
-                domain_scores[domain_id] = {"scores": [], "total": 0, "count": 0}
-            domain_scores[domain_id]["scores"].append(response["score_value"])
-            domain_scores[domain_id]["total"] += response["score_value"]
-            domain_scores[domain_id]["count"] += 1
+        domains_completed = len(domain_rows)
         
-        # Get domain names
-        domains = await db.domains.find().to_list(length=None)
-        domain_name_map = {d["id"]: d["name"] for d in domains}
+        # Names are stored on each response; only responses recorded before that need a lookup
+        domain_name_map = {row["_id"]: row["domain_name"] for row in domain_rows if row.get("domain_name")}
+        if len(domain_name_map) < len(domain_rows):
+            domains_by_id = await taxonomy_cache.get_map("domains")
+            domain_name_map = {**{domain_id: d["name"] for domain_id, d in domains_by_id.items()}, **domain_name_map}
         
         # Format domain scores
         domain_stats = []
-        for domain_id, data in domain_scores.items():
-            avg_score = round(data["total"] / data["count"], 2)
+        for row in domain_rows:
             domain_stats.append({
-                "domain_id": domain_id,
-                "domain_name": domain_name_map.get(domain_id, "Unknown"),
-                "average_score": avg_score,
-                "total_questions": data["count"]
+                "domain_id": row["_id"],
+                "domain_name": domain_name_map.get(row["_id"], "Unknown"),
+                "average_score": round(row["total"] / row["count"], 2),
+                "total_questions": row["count"]
             })
         
         stats = {
@@ -624,15 +1034,14 @@ async def get_user_dashboard_for_admin(user_id: str, current_user: User = Depend
 
 # Admin Content Management
 @api_router.get("/admin/content-stats")
-async def get_content_stats(current_user: User = Depends(get_current_user)):
-    if current_user.role != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-    
-    domains_count = await db.domains.count_documents({})
-    subdomains_count = await db.subdomains.count_documents({})
-    controls_count = await db.controls.count_documents({})
-    metrics_count = await db.metrics.count_documents({})
-    questions_count = await db.questions.count_documents({})
+async def get_content_stats(current_user: User = Depends(require_admin)):
+    domains_count, subdomains_count, controls_count, metrics_count, questions_count = await asyncio.gather(
+        db.domains.count_documents({}),
+        db.subdomains.count_documents({}),
+        db.controls.count_documents({}),
+        db.metrics.count_documents({}),
+        db.questions.count_documents({})
+    )
     
     return {
         "domains": domains_count,
@@ -642,592 +1051,303 @@ async def get_content_stats(current_user: User = Depends(get_current_user)):
         "questions": questions_count
     }
 
-# Domains CRUD
-@api_router.get("/admin/domains")
-async def get_domains_admin(current_user: User = Depends(get_current_user)):
-    if current_user.role != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-    domains = await db.domains.find().sort("order", 1).to_list(length=None)
-    return domains
-
-@api_router.post("/admin/domains")
-async def create_domain(domain_data: dict, current_user: User = Depends(get_current_user)):
-    if current_user.role != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-    domain_data["id"] = str(uuid.uuid4())
-    await db.domains.insert_one(domain_data)
-    return {"message": "Domain created successfully"}
-
-@api_router.put("/admin/domains/{domain_id}")
-async def update_domain(domain_id: str, updates: dict, current_user: User = Depends(get_current_user)):
-    if current_user.role != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-    result = await db.domains.update_one({"id": domain_id}, {"$set": updates})
-    if result.matched_count == 0:
-        raise HTTPException(status_code=404, detail="Domain not found")
-    return {"message": "Domain updated successfully"}
-
-@api_router.delete("/admin/domains/{domain_id}")
-async def delete_domain(domain_id: str, current_user: User = Depends(get_current_user)):
-    if current_user.role != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-    result = await db.domains.delete_one({"id": domain_id})
-    if result.deleted_count == 0:
-        raise HTTPException(status_code=404, detail="Domain not found")
-    return {"message": "Domain deleted successfully"}
-
-# Subdomains CRUD  
-@api_router.get("/admin/subdomains")
-async def get_subdomains_admin(current_user: User = Depends(get_current_user)):
-    if current_user.role != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-    subdomains = await db.subdomains.find().to_list(length=None)
-    for subdomain in subdomains:
-        subdomain.pop('_id', None)
-    return subdomains
-
-@api_router.post("/admin/subdomains")
-async def create_subdomain(subdomain_data: dict, current_user: User = Depends(get_current_user)):
-    if current_user.role != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-    subdomain_data["id"] = str(uuid.uuid4())
-    await db.subdomains.insert_one(subdomain_data)
-    return {"message": "Subdomain created successfully"}
-
-@api_router.put("/admin/subdomains/{subdomain_id}")
-async def update_subdomain(subdomain_id: str, updates: dict, current_user: User = Depends(get_current_user)):
-    if current_user.role != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-    result = await db.subdomains.update_one({"id": subdomain_id}, {"$set": updates})
-    if result.matched_count == 0:
-        raise HTTPException(status_code=404, detail="Subdomain not found")
-    return {"message": "Subdomain updated successfully"}
-
-@api_router.delete("/admin/subdomains/{subdomain_id}")
-async def delete_subdomain(subdomain_id: str, current_user: User = Depends(get_current_user)):
-    if current_user.role != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-    result = await db.subdomains.delete_one({"id": subdomain_id})
-    if result.deleted_count == 0:
-        raise HTTPException(status_code=404, detail="Subdomain not found")
-    return {"message": "Subdomain deleted successfully"}
-
-# Controls CRUD
-@api_router.get("/admin/controls")
-async def get_controls_admin(current_user: User = Depends(get_current_user)):
-    if current_user.role != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-    controls = await db.controls.find().to_list(length=None)
-    for control in controls:
-        control.pop('_id', None)
-    return controls
-
-@api_router.post("/admin/controls")
-async def create_control(control_data: dict, current_user: User = Depends(get_current_user)):
-    if current_user.role != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-    control_data["id"] = str(uuid.uuid4())
-    await db.controls.insert_one(control_data)
-    return {"message": "Control created successfully"}
-
-@api_router.put("/admin/controls/{control_id}")
-async def update_control(control_id: str, updates: dict, current_user: User = Depends(get_current_user)):
-    if current_user.role != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-    result = await db.controls.update_one({"id": control_id}, {"$set": updates})
-    if result.matched_count == 0:
-        raise HTTPException(status_code=404, detail="Control not found")
-    return {"message": "Control updated successfully"}
-
-@api_router.delete("/admin/controls/{control_id}")
-async def delete_control(control_id: str, current_user: User = Depends(get_current_user)):
-    if current_user.role != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-    result = await db.controls.delete_one({"id": control_id})
-    if result.deleted_count == 0:
-        raise HTTPException(status_code=404, detail="Control not found")
-    return {"message": "Control deleted successfully"}
-
-# Metrics CRUD
-@api_router.get("/admin/metrics")
-async def get_metrics_admin(current_user: User = Depends(get_current_user)):
-    if current_user.role != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-    metrics = await db.metrics.find().to_list(length=None)
-    for metric in metrics:
-        metric.pop('_id', None)
-    return metrics
-
-@api_router.post("/admin/metrics")
-async def create_metric(metric_data: dict, current_user: User = Depends(get_current_user)):
-    if current_user.role != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-    metric_data["id"] = str(uuid.uuid4())
-    await db.metrics.insert_one(metric_data)
-    return {"message": "Metric created successfully"}
-
-@api_router.put("/admin/metrics/{metric_id}")
-async def update_metric(metric_id: str, updates: dict, current_user: User = Depends(get_current_user)):
-    if current_user.role != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-    result = await db.metrics.update_one({"id": metric_id}, {"$set": updates})
-    if result.matched_count == 0:
-        raise HTTPException(status_code=404, detail="Metric not found")
-    return {"message": "Metric updated successfully"}
-
-@api_router.delete("/admin/metrics/{metric_id}")
-async def delete_metric(metric_id: str, current_user: User = Depends(get_current_user)):
-    if current_user.role != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-    result = await db.metrics.delete_one({"id": metric_id})
-    if result.deleted_count == 0:
-        raise HTTPException(status_code=404, detail="Metric not found")
-    return {"message": "Metric deleted successfully"}
-
-# Questions CRUD
+# Questions list - answer arrays make question documents heavy, so it streams and omits them by default
 @api_router.get("/admin/questions")
-async def get_questions_admin(current_user: User = Depends(get_current_user)):
-    if current_user.role != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-    questions = await db.questions.find().to_list(length=None)
-    for question in questions:
-        question.pop('_id', None)
-    return questions
-
-@api_router.post("/admin/questions")
-async def create_question(question_data: dict, current_user: User = Depends(get_current_user)):
-    if current_user.role != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-    question_data["id"] = str(uuid.uuid4())
-    await db.questions.insert_one(question_data)
-    return {"message": "Question created successfully"}
-
-@api_router.put("/admin/questions/{question_id}")
-async def update_question(question_id: str, updates: dict, current_user: User = Depends(get_current_user)):
-    if current_user.role != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-    result = await db.questions.update_one({"id": question_id}, {"$set": updates})
-    if result.matched_count == 0:
-        raise HTTPException(status_code=404, detail="Question not found")
-    return {"message": "Question updated successfully"}
-
-@api_router.delete("/admin/questions/{question_id}")
-async def delete_question(question_id: str, current_user: User = Depends(get_current_user)):
-    if current_user.role != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-    result = await db.questions.delete_one({"id": question_id})
-    if result.deleted_count == 0:
-        raise HTTPException(status_code=404, detail="Question not found")
-    return {"message": "Question deleted successfully"}
+async def get_questions_admin(
+    request: Request,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(ADMIN_PAGE_SIZE, ge=1, le=ADMIN_MAX_PAGE_SIZE),
+    include_answers: bool = False,
+    current_user: User = Depends(require_admin)
+):
+    etag = taxonomy_cache.etag("questions")
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    
+    # Answer lists are the bulk of each question document, so list views omit them unless asked
+    projection = {"_id": 0} if include_answers else {"_id": 0, "answers": 0}
+    cursor = db.questions.find({}, projection).hint("_id_").skip(skip).limit(limit).batch_size(500)
+    return stream_json_array(cursor, etag)
+
+def register_admin_crud(collection: str, model: type, patch_model: type, label: str, with_list: bool = True):
+    """Register the admin list/create/update/delete routes for a collection keyed by `id`."""
+    def invalidate():
+        taxonomy_cache.invalidate(collection)
+    
+    async def list_items(
+        request: Request,
+        skip: int = Query(0, ge=0),
+        limit: int = Query(ADMIN_PAGE_SIZE, ge=1, le=ADMIN_MAX_PAGE_SIZE),
+        current_user: User = Depends(require_admin)
+    ):
+        etag = taxonomy_cache.etag(collection)
+        cached = not_modified(request, etag)
+        if cached:
+            return cached
+        
+        cursor = db[collection].find({}, {"_id": 0}).hint("_id_").skip(skip).limit(limit).batch_size(500)
+        return stream_json_array(cursor, etag)
+    
+    async def create_item(item: model, current_user: User = Depends(require_admin)):
+        # Ids are always assigned here, never taken from the client
+        doc = item.model_dump()
+        doc["id"] = _uid()
+        try:
+            await db[collection].insert_one(doc)
+        except DuplicateKeyError:
+            raise HTTPException(status_code=409, detail=f"{label} already exists")
+        invalidate()
+        return {"message": f"{label} created successfully"}
+    
+    async def update_item(item_id: str, updates: patch_model, current_user: User = Depends(require_admin)):
+        set_doc = patch_set_doc(updates)
+        if not set_doc:
+            raise HTTPException(status_code=400, detail="No fields to update")
+        
+        result = await db[collection].update_one({"id": item_id}, {"$set": set_doc})
+        invalidate()
+        if result.matched_count == 0:
+            raise HTTPException(status_code=404, detail=f"{label} not found")
+        return {"message": f"{label} updated successfully"}
+    
+    async def delete_item(item_id: str, current_user: User = Depends(require_admin)):
+        result = await db[collection].delete_one({"id": item_id})
+        invalidate()
+        if result.deleted_count == 0:
+            raise HTTPException(status_code=404, detail=f"{label} not found")
+        return {"message": f"{label} deleted successfully"}
+    
+    path = f"/admin/{collection}"
+    if with_list:
+        api_router.add_api_route(path, list_items, methods=["GET"], name=f"get_{collection}_admin")
+    api_router.add_api_route(path, create_item, methods=["POST"], name=f"create_{collection}")
+    api_router.add_api_route(f"{path}/{{item_id}}", update_item, methods=["PUT"], name=f"update_{collection}")
+    api_router.add_api_route(f"{path}/{{item_id}}", delete_item, methods=["DELETE"], name=f"delete_{collection}")
+
+# Subdomains, controls, metrics and questions CRUD - (collection, model, patch model, label)
+for _collection, _model, _patch_model, _label in [
+    ("subdomains", SubDomain, SubDomainPatch, "Subdomain"),
+    ("controls", Control, ControlPatch, "Control"),
+    ("metrics", Metric, MetricPatch, "Metric"),
+    ("questions", Question, QuestionPatch, "Question"),
+]:
+    register_admin_crud(_collection, _model, _patch_model, _label, with_list=_collection != "questions")
 
 # Admin Content Management - Domains
 @api_router.get("/admin/domains", response_model=List[Domain])
-async def get_domains_admin(current_user: User = Depends(get_current_user)):
-    if current_user.role != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
+async def get_domains_admin(request: Request, current_user: User = Depends(require_admin)):
+    etag = taxonomy_cache.etag("domains")
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
     
-    domains = await db.domains.find().sort("order", 1).to_list(length=None)
-    return [Domain(**domain) for domain in domains]
+    return stream_json_array(db.domains.find({}, {"_id": 0}).sort("order", 1), etag)
 
 @api_router.post("/admin/domains")
-async def create_domain(domain: Domain, current_user: User = Depends(get_current_user)):
-    if current_user.role != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-    
-    await db.domains.insert_one(domain.dict())
+async def create_domain(domain: Domain, current_user: User = Depends(require_admin)):
+    # Ids are always assigned here, never taken from the client
+    doc = domain.model_dump()
+    doc["id"] = _uid()
+    try:
+        await db.domains.insert_one(doc)
+    except DuplicateKeyError:
+        raise HTTPException(status_code=409, detail="Domain already exists")
+    taxonomy_cache.invalidate("domains")
     return {"message": "Domain created successfully"}
 
 @api_router.put("/admin/domains/{domain_id}")
-async def update_domain(domain_id: str, updates: dict, current_user: User = Depends(get_current_user)):
-    if current_user.role != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
+async def update_domain(domain_id: str, updates: DomainPatch, current_user: User = Depends(require_admin)):
+    set_doc = patch_set_doc(updates)
+    if not set_doc:
+        raise HTTPException(status_code=400, detail="No fields to update")
     
-    result = await db.domains.update_one({"id": domain_id}, {"$set": updates})
+    result = await db.domains.update_one({"id": domain_id}, {"$set": set_doc})
+    taxonomy_cache.invalidate("domains")
     if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="Domain not found")
     
     return {"message": "Domain updated successfully"}
 
 @api_router.delete("/admin/domains/{domain_id}")
-async def delete_domain(domain_id: str, current_user: User = Depends(get_current_user)):
-    if current_user.role != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-    
-    # Delete related data
-    await db.questions.delete_many({"domain_id": domain_id})
-    await db.subdomains.delete_many({"domain_id": domain_id})
-    
-    result = await db.domains.delete_one({"id": domain_id})
+async def delete_domain(domain_id: str, current_user: User = Depends(require_admin)):
+    # Delete the domain and its related data concurrently
+    _, _, result = await asyncio.gather(
+        db.questions.delete_many({"domain_id": domain_id}),
+        db.subdomains.delete_many({"domain_id": domain_id}),
+        db.domains.delete_one({"id": domain_id})
+    )
+    taxonomy_cache.invalidate("questions")
+    taxonomy_cache.invalidate("subdomains")
+    taxonomy_cache.invalidate("domains")
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Domain not found")
     
     return {"message": "Domain and related data deleted successfully"}
 
-# Admin Content Management - Subdomains
-@api_router.get("/admin/subdomains")
-async def get_subdomains_admin(current_user: User = Depends(get_current_user)):
-    if current_user.role != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-    
-    subdomains = await db.subdomains.find().to_list(length=None)
-    return subdomains
-
-@api_router.post("/admin/subdomains")
-async def create_subdomain(subdomain: SubDomain, current_user: User = Depends(get_current_user)):
-    if current_user.role != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-    
-    await db.subdomains.insert_one(subdomain.dict())
-    return {"message": "Subdomain created successfully"}
-
-@api_router.put("/admin/subdomains/{subdomain_id}")
-async def update_subdomain(subdomain_id: str, updates: dict, current_user: User = Depends(get_current_user)):
-    if current_user.role != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-    
-    result = await db.subdomains.update_one({"id": subdomain_id}, {"$set": updates})
-    if result.matched_count == 0:
-        raise HTTPException(status_code=404, detail="Subdomain not found")
-    
-    return {"message": "Subdomain updated successfully"}
-
-@api_router.delete("/admin/subdomains/{subdomain_id}")
-async def delete_subdomain(subdomain_id: str, current_user: User = Depends(get_current_user)):
-    if current_user.role != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-    
-    result = await db.subdomains.delete_one({"id": subdomain_id})
-    if result.deleted_count == 0:
-        raise HTTPException(status_code=404, detail="Subdomain not found")
-    
-    return {"message": "Subdomain deleted successfully"}
-
-# Admin Content Management - Controls
-@api_router.get("/admin/controls")
-async def get_controls_admin(current_user: User = Depends(get_current_user)):
-    if current_user.role != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-    
-    controls = await db.controls.find().to_list(length=None)
-    return controls
-
-@api_router.post("/admin/controls")
-async def create_control(control: Control, current_user: User = Depends(get_current_user)):
-    if current_user.role != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-    
-    await db.controls.insert_one(control.dict())
-    return {"message": "Control created successfully"}
-
-@api_router.put("/admin/controls/{control_id}")
-async def update_control(control_id: str, updates: dict, current_user: User = Depends(get_current_user)):
-    if current_user.role != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-    
-    result = await db.controls.update_one({"id": control_id}, {"$set": updates})
-    if result.matched_count == 0:
-        raise HTTPException(status_code=404, detail="Control not found")
-    
-    return {"message": "Control updated successfully"}
-
-@api_router.delete("/admin/controls/{control_id}")
-async def delete_control(control_id: str, current_user: User = Depends(get_current_user)):
-    if current_user.role != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-    
-    result = await db.controls.delete_one({"id": control_id})
-    if result.deleted_count == 0:
-        raise HTTPException(status_code=404, detail="Control not found")
-    
-    return {"message": "Control deleted successfully"}
-
-# Admin Content Management - Questions
-@api_router.get("/admin/questions")
-async def get_questions_admin(current_user: User = Depends(get_current_user)):
-    if current_user.role != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-    
-    questions = await db.questions.find().to_list(length=None)
-    return questions
+# Sample assessment content lives in seed_data.json. Ids are uuid5s of each record's path under SEED_NAMESPACE,
+# so every run seeds the same ids and the flattened documents are built once at import.
+SEED_NAMESPACE = uuid.UUID("fe414bf9-14d1-41bf-9410-b8ace3165166")
+
+def _seed_id(*path: str) -> str:
+    return uuid.uuid5(SEED_NAMESPACE, "/".join(path)).hex
+
+def _load_seed_data(path: Path) -> Dict[str, List[Dict[str, Any]]]:
+    with open(path, encoding="utf-8") as f:
+        spec = json.load(f)
+    
+    seed = {name: [] for name in ("domains", "subdomains", "controls", "metrics", "questions")}
+    for order, domain in enumerate(spec["domains"], start=1):
+        domain_id = _seed_id(domain["name"])
+        seed["domains"].append({
+            "id": domain_id,
+            "name": domain["name"],
+            "description": domain["description"],
+            "icon": domain["icon"],
+            "order": order
+        })
+        
+        # Each subdomain has one control, each control one metric and one question
+        for subdomain in domain["subdomains"]:
+            subdomain_id = _seed_id(domain["name"], subdomain["name"])
+            control_id = _seed_id(domain["name"], subdomain["name"], "control")
+            metric_id = _seed_id(domain["name"], subdomain["name"], "metric")
+            question_id = _seed_id(domain["name"], subdomain["name"], "question")
+            
+            seed["subdomains"].append({"id": subdomain_id, "name": subdomain["name"], "domain_id": domain_id})
+            seed["controls"].append({
+                "id": control_id,
+                "name": subdomain["control"]["name"],
+                "definition": subdomain["control"]["definition"],
+                "subdomain_id": subdomain_id
+            })
+            seed["metrics"].append({"id": metric_id, "name": subdomain["metric"], "control_id": control_id})
+            seed["questions"].append({
+                "id": question_id,
+                "question_text": subdomain["question"],
+                "domain_id": domain_id,
+                "subdomain_id": subdomain_id,
+                "control_id": control_id,
+                "metric_id": metric_id,
+                "answers": [
+                    {"id": _seed_id(question_id, str(answer["score_value"])), **answer}
+                    for answer in spec["answers"]
+                ]
+            })
+    return seed
 
-@api_router.post("/admin/questions")
-async def create_question(question: Question, current_user: User = Depends(get_current_user)):
-    if current_user.role != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-    
-    await db.questions.insert_one(question.dict())
-    return {"message": "Question created successfully"}
+SEED_DATA = _load_seed_data(ROOT_DIR / "seed_data.json")
 
-@api_router.put("/admin/questions/{question_id}")
-async def update_question(question_id: str, updates: dict, current_user: User = Depends(get_current_user)):
-    if current_user.role != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-    
-    result = await db.questions.update_one({"id": question_id}, {"$set": updates})
-    if result.matched_count == 0:
-        raise HTTPException(status_code=404, detail="Question not found")
-    
-    return {"message": "Question updated successfully"}
+# Advisory lock so concurrent init-data calls (or the seed script racing the API) can't seed twice
+INIT_LOCK_LEASE_SECONDS = 300
 
-@api_router.delete("/admin/questions/{question_id}")
-async def delete_question(question_id: str, current_user: User = Depends(get_current_user)):
-    if current_user.role != "admin":
-        raise HTTPException(status_code=403, detail="Admin access required")
-    
-    result = await db.questions.delete_one({"id": question_id})
-    if result.deleted_count == 0:
-        raise HTTPException(status_code=404, detail="Question not found")
+async def seed_sample_data(database) -> Dict[str, Any]:
+    """Insert the sample assessment content and default users unless domains already exist"""
+    now = datetime.now(timezone.utc)
+    try:
+        # Matches only an expired lease; while another run holds the lock the upsert hits the _id index instead
+        await database.locks.find_one_and_update(
+            {"_id": "init-data", "expires_at": {"$lt": now}},
+            {"$set": {"expires_at": now + timedelta(seconds=INIT_LOCK_LEASE_SECONDS)}},
+            upsert=True
+        )
+    except DuplicateKeyError:
+        return {"message": "Data initialization already in progress"}
     
-    return {"message": "Question deleted successfully"}
+    try:
+        # Check if data already exists
+        existing_domains = await database.domains.estimated_document_count()
+        if existing_domains > 0:
+            return {"message": "Data already initialized"}
+        
+        # Create default admin and test users
+        default_users = [
+            User(
+                first_name="Admin",
+                last_name="User", 
+                organization_name="System",
+                email="admin@secassess.com",
+                designation="System Administrator",
+                password_hash=_DEFAULT_ADMIN_HASH,
+                role="admin"
+            ),
+            User(
+                first_name="RKS",
+                last_name="Admin",
+                organization_name="Security Assessment",
+                email="rks9454@gmail.com", 
+                designation="Platform Administrator",
+                password_hash=_DEFAULT_ADMIN_HASH,
+                role="admin"
+            ),
+            User(
+                first_name="Test",
+                last_name="User",
+                organization_name="Test Organization",
+                email="testuser@example.com",
+                designation="Security Analyst",
+                password_hash=_DEFAULT_USER_HASH,
+                role="user"
+            )
+        ]
+        
+        # The collections don't reference each other at write time, so the batches can go out concurrently.
+        # insert_many adds _id to the documents it is given, so each run inserts shallow copies.
+        await asyncio.gather(
+            *(
+                database[name].insert_many([dict(doc) for doc in docs], ordered=False)
+                for name, docs in SEED_DATA.items()
+            ),
+            database.users.insert_many([user.model_dump() for user in default_users], ordered=False)
+        )
+        
+        return {
+            "message": "Complete sample data initialized successfully", 
+            "domains_created": len(SEED_DATA["domains"]),
+            "questions_per_domain": 2,
+            "total_questions": len(SEED_DATA["questions"]),
+            "users_created": len(default_users),
+            "admin_credentials": [
+                {"email": "admin@secassess.com", "password": "admin123"},
+                {"email": "rks9454@gmail.com", "password": "admin123"}
+            ],
+            "test_user_credentials": {"email": "testuser@example.com", "password": "user123"}
+        }
+    finally:
+        await database.locks.delete_one({"_id": "init-data"})
 
 # Initialize sample data
 @api_router.post("/admin/init-data")
 async def initialize_sample_data():
     """Initialize the database with sample assessment data"""
-    
-    # Check if data already exists
-    existing_domains = await db.domains.count_documents({})
-    if existing_domains > 0:
-        return {"message": "Data already initialized"}
-    
-    # Create sample domains - CORRECT DOMAIN NAMES
-    domains = [
-        {"id": str(uuid.uuid4()), "name": "Application", "description": "Application security and development practices", "icon": "💻", "order": 1},
-        {"id": str(uuid.uuid4()), "name": "Data Management", "description": "Data handling, storage, and security practices", "icon": "📊", "order": 2},
-        {"id": str(uuid.uuid4()), "name": "Model Development and Deployment", "description": "ML model lifecycle and deployment security", "icon": "🚀", "order": 3},
-        {"id": str(uuid.uuid4()), "name": "Model Governance", "description": "Model oversight, compliance, and risk management", "icon": "⚖️", "order": 4},
-        {"id": str(uuid.uuid4()), "name": "Infrastructure", "description": "Infrastructure security and management", "icon": "🏗️", "order": 5}
-    ]
-    
-    await db.domains.insert_many(domains)
-    
-    # Create comprehensive sample data for ALL domains
-    all_questions = []
-    
-    for domain_idx, domain in enumerate(domains):
-        domain_id = domain["id"]
-        
-        # Create subdomains for each domain
-        subdomains = []
-        if domain["name"] == "Application":
-            subdomains = [
-                {"id": str(uuid.uuid4()), "name": "Code Security", "domain_id": domain_id},
-                {"id": str(uuid.uuid4()), "name": "Application Architecture", "domain_id": domain_id}
-            ]
-        elif domain["name"] == "Data Management":
-            subdomains = [
-                {"id": str(uuid.uuid4()), "name": "Data Storage", "domain_id": domain_id},
-                {"id": str(uuid.uuid4()), "name": "Data Privacy", "domain_id": domain_id}
-            ]
-        elif domain["name"] == "Model Development and Deployment":
-            subdomains = [
-                {"id": str(uuid.uuid4()), "name": "Model Development", "domain_id": domain_id},
-                {"id": str(uuid.uuid4()), "name": "Deployment Pipeline", "domain_id": domain_id}
-            ]
-        elif domain["name"] == "Model Governance":
-            subdomains = [
-                {"id": str(uuid.uuid4()), "name": "Model Oversight", "domain_id": domain_id},
-                {"id": str(uuid.uuid4()), "name": "Compliance Management", "domain_id": domain_id}
-            ]
-        else:  # Infrastructure
-            subdomains = [
-                {"id": str(uuid.uuid4()), "name": "Infrastructure Security", "domain_id": domain_id},
-                {"id": str(uuid.uuid4()), "name": "System Management", "domain_id": domain_id}
-            ]
-        
-        await db.subdomains.insert_many(subdomains)
-        
-        # Create controls for each subdomain
-        controls = []
-        for subdomain in subdomains:
-            if "Policies" in subdomain["name"] or "Authentication" in subdomain["name"] or "Classification" in subdomain["name"] or "Firewall" in subdomain["name"] or "Detection" in subdomain["name"]:
-                control_name = f"{subdomain['name']} Framework"
-                control_def = f"Established {subdomain['name'].lower()} framework and procedures"
-            else:
-                control_name = f"{subdomain['name']} Process"
-                control_def = f"Systematic {subdomain['name'].lower()} process and controls"
-            
-            controls.append({
-                "id": str(uuid.uuid4()),
-                "name": control_name,
-                "definition": control_def,
-                "subdomain_id": subdomain["id"]
-            })
-        
-        await db.controls.insert_many(controls)
-        
-        # Create metrics for each control
-        metrics = []
-        for control in controls:
-            metrics.append({
-                "id": str(uuid.uuid4()),
-                "name": f"{control['name']} Effectiveness",
-                "control_id": control["id"]
-            })
-        
-        await db.metrics.insert_many(metrics)
-        
-        # Create questions for each domain
-        domain_questions = []
-        
-        if domain["name"] == "Application":
-            domain_questions = [
-                {
-                    "question_text": "How comprehensive are your application security code review practices?",
-                    "subdomain_id": subdomains[0]["id"],
-                    "control_id": controls[0]["id"],
-                    "metric_id": metrics[0]["id"]
-                },
-                {
-                    "question_text": "How well-designed is your application architecture for security and scalability?",
-                    "subdomain_id": subdomains[1]["id"], 
-                    "control_id": controls[1]["id"],
-                    "metric_id": metrics[1]["id"]
-                }
-            ]
-        elif domain["name"] == "Data Management":
-            domain_questions = [
-                {
-                    "question_text": "How robust are your data storage and backup strategies?",
-                    "subdomain_id": subdomains[0]["id"],
-                    "control_id": controls[0]["id"],
-                    "metric_id": metrics[0]["id"]
-                },
-                {
-                    "question_text": "How effectively do you manage data privacy and user consent?",
-                    "subdomain_id": subdomains[1]["id"],
-                    "control_id": controls[1]["id"],
-                    "metric_id": metrics[1]["id"]
-                }
-            ]
-        elif domain["name"] == "Model Development and Deployment":
-            domain_questions = [
-                {
-                    "question_text": "How systematic is your model development and testing process?",
-                    "subdomain_id": subdomains[0]["id"],
-                    "control_id": controls[0]["id"],
-                    "metric_id": metrics[0]["id"]
-                },
-                {
-                    "question_text": "How mature is your model deployment pipeline and monitoring?",
-                    "subdomain_id": subdomains[1]["id"],
-                    "control_id": controls[1]["id"],
-                    "metric_id": metrics[1]["id"]
-                }
-            ]
-        elif domain["name"] == "Model Governance":
-            domain_questions = [
-                {
-                    "question_text": "How comprehensive is your model oversight and risk management framework?",
-                    "subdomain_id": subdomains[0]["id"],
-                    "control_id": controls[0]["id"],
-                    "metric_id": metrics[0]["id"]
-                },
-                {
-                    "question_text": "How well do you manage compliance and regulatory requirements for models?",
-                    "subdomain_id": subdomains[1]["id"],
-                    "control_id": controls[1]["id"],
-                    "metric_id": metrics[1]["id"]
-                }
-            ]
-        else:  # Infrastructure
-            domain_questions = [
-                {
-                    "question_text": "How secure and well-managed is your infrastructure setup?",
-                    "subdomain_id": subdomains[0]["id"],
-                    "control_id": controls[0]["id"],
-                    "metric_id": metrics[0]["id"]
-                },
-                {
-                    "question_text": "How effective are your system monitoring and maintenance practices?",
-                    "subdomain_id": subdomains[1]["id"],
-                    "control_id": controls[1]["id"],
-                    "metric_id": metrics[1]["id"]
-                }
-            ]
-        
-        # Add standard answers to each question
-        for question_data in domain_questions:
-            question = {
-                "id": str(uuid.uuid4()),
-                "question_text": question_data["question_text"],
-                "domain_id": domain_id,
-                "subdomain_id": question_data["subdomain_id"],
-                "control_id": question_data["control_id"],
-                "metric_id": question_data["metric_id"],
-                "answers": [
-                    {"id": str(uuid.uuid4()), "answer_text": "Not implemented or very poor", "score_value": 0},
-                    {"id": str(uuid.uuid4()), "answer_text": "Basic implementation with significant gaps", "score_value": 1},
-                    {"id": str(uuid.uuid4()), "answer_text": "Partially implemented covering key areas", "score_value": 2},
-                    {"id": str(uuid.uuid4()), "answer_text": "Well implemented but needs improvement", "score_value": 3},
-                    {"id": str(uuid.uuid4()), "answer_text": "Comprehensive implementation with regular reviews", "score_value": 4},
-                    {"id": str(uuid.uuid4()), "answer_text": "Excellent implementation with continuous improvement", "score_value": 5}
-                ]
-            }
-            all_questions.append(question)
-    
-    await db.questions.insert_many(all_questions)
-    
-    # Create default admin and test users
-    default_users = [
-        User(
-            first_name="Admin",
-            last_name="User", 
-            organization_name="System",
-            email="admin@secassess.com",
-            designation="System Administrator",
-            password_hash=hash_password("admin123"),
-            role="admin"
-        ),
-        User(
-            first_name="RKS",
-            last_name="Admin",
-            organization_name="Security Assessment",
-            email="rks9454@gmail.com", 
-            designation="Platform Administrator",
-            password_hash=hash_password("admin123"),
-            role="admin"
-        ),
-        User(
-            first_name="Test",
-            last_name="User",
-            organization_name="Test Organization",
-            email="testuser@example.com",
-            designation="Security Analyst",
-            password_hash=hash_password("user123"),
-            role="user"
-        )
-    ]
-    
-    for user in default_users:
-        await db.users.insert_one(user.dict())
-    
-    return {
-        "message": "Complete sample data initialized successfully", 
-        "domains_created": len(domains),
-        "questions_per_domain": 2,
-        "total_questions": len(all_questions),
-        "users_created": len(default_users),
-        "admin_credentials": [
-            {"email": "admin@secassess.com", "password": "admin123"},
-            {"email": "rks9454@gmail.com", "password": "admin123"}
-        ],
-        "test_user_credentials": {"email": "testuser@example.com", "password": "user123"}
-    }
+    result = await seed_sample_data(db)
+    # Only a seed that actually wrote data invalidates the cache; this route is
+    # unauthenticated, so repeated calls must not be able to keep flushing it
+    if "domains_created" in result:
+        taxonomy_cache.clear()
+        await refresh_dummy_hash()
+    return result
 
 @api_router.post("/admin/clear-data")
-async def clear_all_data():
+async def clear_all_data(current_user: User = Depends(require_admin)):
     """Clear all data from database - USE WITH CAUTION"""
     try:
-        # Clear all collections
-        await db.domains.delete_many({})
-        await db.subdomains.delete_many({})
-        await db.controls.delete_many({})
-        await db.metrics.delete_many({})
-        await db.questions.delete_many({})
-        await db.users.delete_many({})
-        await db.user_assessments.delete_many({})
-        await db.user_responses.delete_many({})
+        # Drop all collections - dropping takes their indexes with them, so those are rebuilt afterwards
+        await asyncio.gather(
+            db.domains.drop(),
+            db.subdomains.drop(),
+            db.controls.drop(),
+            db.metrics.drop(),
+            db.questions.drop(),
+            db.users.drop(),
+            db.user_assessments.drop(),
+            db.user_responses.drop()
+        )
+        await ensure_indexes()
+        taxonomy_cache.clear()
+        await refresh_dummy_hash()
+        # Every user is gone, so every outstanding token is revoked
+        await revocation_list.revoke("*", "cleared")
         
         return {"message": "All data cleared successfully"}
     except Exception as e:
@@ -1236,12 +1356,16 @@ async def clear_all_data():
 # Include the router in the main app
 app.include_router(api_router)
 
+# Allowed origins, parsed once - credentials are only allowed with an explicit origin list, never with "*"
+CORS_ORIGINS = tuple(origin.strip() for origin in os.environ.get('CORS_ORIGINS', '*').split(',') if origin.strip())
+
 app.add_middleware(
     CORSMiddleware,
-    allow_credentials=True,
-    allow_origins=os.environ.get('CORS_ORIGINS', '*').split(','),
+    allow_credentials="*" not in CORS_ORIGINS,
+    allow_origins=CORS_ORIGINS,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # Configure logging
@@ -1251,6 +1375,95 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@app.on_event("startup")
+async def startup_db_client():
+    global client, db
+    client = AsyncMongoClient(
+        mongo_url,
+        maxPoolSize=MONGO_POOL_SIZE,
+        minPoolSize=MONGO_MIN_POOL_SIZE,
+        maxIdleTimeMS=60000,
+        waitQueueTimeoutMS=MONGO_WAIT_QUEUE_TIMEOUT_MS,
+        serverSelectionTimeoutMS=5000,
+        retryWrites=True,
+        compressors=MONGO_COMPRESSORS
+    )
+    db = client[os.environ['DB_NAME']]
+
+@app.on_event("startup")
+async def ensure_indexes():
+    # Prefix-covered indexes (user_assessments.user_id, user_responses.assessment_id) are served by the compound ones
+    await asyncio.gather(
+        db.users.create_index("id", unique=True),
+        db.users.create_index("email", unique=True),
+        db.user_assessments.create_index("id", unique=True),
+        db.user_assessments.create_index([("user_id", 1), ("submission_date", -1), ("id", -1)]),
+        db.user_assessments.create_index([("submission_date", -1)]),
+        db.user_responses.create_index([("assessment_id", 1), ("domain_id", 1), ("control_id", 1)]),
+        db.questions.create_index("id", unique=True),
+        db.questions.create_index("domain_id"),
+        db.subdomains.create_index("id", unique=True),
+        db.subdomains.create_index("domain_id"),
+        db.controls.create_index("id", unique=True),
+        db.metrics.create_index("id", unique=True),
+        db.domains.create_index("id", unique=True),
+        db.domains.create_index("order"),
+        db.token_revocations.create_index("user_id", unique=True),
+        db.token_revocations.create_index("expires_at", expireAfterSeconds=0)
+    )
+
+# Collections whose changes invalidate in-process state on every worker
+_WATCHED_COLLECTIONS = TaxonomyCache.COLLECTIONS + ("questions", "token_revocations")
+
+# Error code for "The $changeStream stage is only supported on replica sets"
+CHANGE_STREAM_UNSUPPORTED_CODE = 40573
+
+async def watch_for_invalidations():
+    """Apply writes made by other workers to the in-process caches as soon as they happen.
+
+    Change streams need a replica set; on a standalone server this logs once and the caches rely on their TTLs.
+    """
+    pipeline = [{"$match": {"ns.coll": {"$in": list(_WATCHED_COLLECTIONS)}}}]
+    while True:
+        try:
+            async with await db.watch(pipeline) as stream:
+                # Anything written while the stream was down is unknown, so start from a clean slate
+                taxonomy_cache.clear()
+                revocation_list.expire()
+                async for change in stream:
+                    # Database-level events (dropDatabase, invalidate) carry no collection; an invalidate also
+                    # closes the stream, and the reconnect above clears everything
+                    name = change.get("ns", {}).get("coll")
+                    if name is None:
+                        continue
+                    if name == "token_revocations":
+                        revocation_list.expire()
+                    else:
+                        taxonomy_cache.invalidate(name)
+        except OperationFailure as e:
+            # Only a server without change stream support ends the watcher; anything else (lost resume history,
+            # a failover) is transient and handled like any other interruption
+            if e.code == CHANGE_STREAM_UNSUPPORTED_CODE:
+                logger.info("Change streams unavailable, caches fall back to TTL expiry: %s", e)
+                return
+            logger.warning("Change stream failed, reconnecting", exc_info=True)
+            await asyncio.sleep(5)
+        except PyMongoError:
+            logger.warning("Change stream interrupted, reconnecting", exc_info=True)
+            await asyncio.sleep(5)
+
+@app.on_event("startup")
+async def pick_dummy_hash():
+    await refresh_dummy_hash()
+
+@app.on_event("startup")
+async def start_invalidation_watcher():
+    global invalidation_task
+    invalidation_task = asyncio.create_task(watch_for_invalidations())
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
-    client.close()
\ No newline at end of file
+    if invalidation_task is not None:
+        invalidation_task.cancel()
+    await client.close()
+    _password_hash_executor.shutdown(wait=False)
\ No newline at end of file
@@ -4,34 +4,269 @@ Security Assessment App Backend API Testing
 Tests the complete assessment workflow from registration to results.
 """
 
-import requests
+import argparse
+import asyncio
+import base64
+import httpx
+import io
 import json
+import orjson
+import os
+import sys
+import time
 import uuid
-from datetime import datetime
+from collections import defaultdict
+from pathlib import Path
 
 # Configuration
 BASE_URL = "https://secassess-1.preview.emergentagent.com/api"
-TEST_USER_EMAIL = f"testuser_{uuid.uuid4().hex[:8]}@example.com"
+# Setting SECASSESS_TEST_EMAIL reuses one test account across runs (e.g. in CI); its token is then cached on disk
+REUSED_TEST_EMAIL = os.environ.get("SECASSESS_TEST_EMAIL")
+TEST_USER_EMAIL = REUSED_TEST_EMAIL or f"testuser_{uuid.uuid4().hex[:8]}@example.com"
+TOKEN_CACHE_PATH = Path.home() / ".cache" / "secassess" / "token.json"
+# Cached tokens this close to expiry are not reused
+TOKEN_MIN_REMAINING_SECONDS = 300
 TEST_USER_PASSWORD = "SecurePass123!"
+# Default file for --record / --replay runs
+RECORDING_PATH = Path("backend_test_responses.json")
+# Stands in for the JWTs in recorded responses; replays never send tokens to a server, so any value works
+REDACTED_TOKEN = "redacted"
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Fields each response object must contain, checked with a subset test against its keys
+DOMAIN_REQUIRED = frozenset(("id", "name", "order"))
+QUESTION_REQUIRED = frozenset(("id", "question_text", "answers", "domain_id"))
+ASSESSMENT_REQUIRED = frozenset(("id", "user_id", "submission_date", "status"))
+STATS_REQUIRED = frozenset(("total_responses", "domains_completed", "overall_average"))
+
+def parse_json(response):
+    """Decode a response body with orjson instead of the stdlib json module"""
+    return orjson.loads(response.content)
+
+class RetryTransport(httpx.AsyncBaseTransport):
+    """Retry connection failures and transient gateway errors with exponential backoff"""
+    
+    RETRY_EXCEPTIONS = (httpx.ConnectError, httpx.ReadError, httpx.RemoteProtocolError)
+    
+    def __init__(self, transport, total=3, backoff_factor=0.3, status_forcelist=(502, 503, 504)):
+        self.transport = transport
+        self.total = total
+        self.backoff_factor = backoff_factor
+        self.status_forcelist = frozenset(status_forcelist)
+    
+    async def handle_async_request(self, request):
+        for attempt in range(self.total + 1):
+            try:
+                response = await self.transport.handle_async_request(request)
+            except self.RETRY_EXCEPTIONS:
+                if attempt == self.total:
+                    raise
+            else:
+                if response.status_code not in self.status_forcelist or attempt == self.total:
+                    return response
+                await response.aclose()
+            await asyncio.sleep(self.backoff_factor * (2 ** attempt))
+    
+    async def aclose(self):
+        await self.transport.aclose()
+
+def redact_tokens(content):
+    """Replace the token of an auth response so recordings never hold a live JWT"""
+    try:
+        data = orjson.loads(content)
+    except orjson.JSONDecodeError:
+        return content
+    if not isinstance(data, dict) or "token" not in data:
+        return content
+    data["token"] = REDACTED_TOKEN
+    return orjson.dumps(data)
+
+def exchange_key(request):
+    """Identify a request for replay by method, URL and body"""
+    return (request.method, str(request.url), request.content.decode("utf-8"))
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """Pass requests through and keep every exchange so the run can be replayed without a backend"""
+    
+    def __init__(self, transport):
+        self.transport = transport
+        self.exchanges = []
+    
+    async def handle_async_request(self, request):
+        response = await self.transport.handle_async_request(request)
+        content = await response.aread()
+        method, url, body = exchange_key(request)
+        self.exchanges.append({
+            "method": method,
+            "url": url,
+            "body": body,
+            "authorized": "Authorization" in request.headers,
+            "status_code": response.status_code,
+            "content_type": response.headers.get("content-type"),
+            "content": redact_tokens(content).decode("utf-8")
+        })
+        return response
+    
+    async def aclose(self):
+        await self.transport.aclose()
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """Serve recorded responses; repeats of the same request get the recorded responses in order"""
+    
+    def __init__(self, exchanges):
+        self.responses = defaultdict(list)
+        for exchange in exchanges:
+            self.responses[(exchange["method"], exchange["url"], exchange["body"])].append(exchange)
+    
+    async def handle_async_request(self, request):
+        recorded = self.responses.get(exchange_key(request))
+        if not recorded:
+            raise httpx.ConnectError(f"No recorded response for {request.method} {request.url}", request=request)
+        # Prefer a response recorded with the same credentials state (e.g. the unauthenticated probe); whether a
+        # public endpoint was called before or after login depends on test timing, so that is only a preference
+        authorized = "Authorization" in request.headers
+        index = next((i for i, exchange in enumerate(recorded) if exchange["authorized"] == authorized), 0)
+        # The last recorded response keeps answering once the earlier ones are used up
+        exchange = recorded.pop(index) if len(recorded) > 1 else recorded[0]
+        headers = {"Content-Type": exchange["content_type"]} if exchange["content_type"] else {}
+        return httpx.Response(exchange["status_code"], headers=headers, content=exchange["content"].encode("utf-8"))
+
+def build_responses(questions):
+    """Create sample responses - the middle answer (score 2-3) of every question with at least three answers"""
+    return [
+        {"question_id": question["id"], "selected_answer_id": answers[len(answers) // 2]["id"]}
+        for question in questions
+        if len(answers := question["answers"]) >= 3
+    ]
 
 class SecurityAssessmentTester:
-    def __init__(self):
-        self.base_url = BASE_URL
-        self.session = requests.Session()
+    def __init__(self, mode="live", recording_path=RECORDING_PATH):
+        # "live" calls the API, "record" also saves every exchange, "replay" serves a saved recording instead
+        self.mode = mode
+        self.recording_path = recording_path
+        self.recording = orjson.loads(recording_path.read_bytes()) if mode == "replay" else None
+        self.base_url = self.recording["base_url"] if self.recording else BASE_URL
+        # A replay must send the same request bodies as the recorded run, so it uses that run's test account
+        self.test_user_email = self.recording["test_user_email"] if self.recording else TEST_USER_EMAIL
+        self.session = None
         self.auth_token = None
         self.user_data = None
         self.domains = []
         self.questions = []
         self.assessment_id = None
+        self.token_from_cache = False
+        # Request bodies that never change during a run, serialized once
+        self._register_body = orjson.dumps({
+            "first_name": "John",
+            "last_name": "Doe",
+            "organization_name": "Test Security Corp",
+            "email": self.test_user_email,
+            "corporate_email": f"corporate_{self.test_user_email}",
+            "designation": "Security Analyst",
+            "contact_number": "+1234567890",
+            "password": TEST_USER_PASSWORD
+        })
+        self._user_login_body = orjson.dumps({"email": self.test_user_email, "password": TEST_USER_PASSWORD})
+        self._admin_login_body = orjson.dumps({"email": "admin@secassess.com", "password": "admin123"})
+        self._log_buffer = io.StringIO()
+        
+    async def __aenter__(self):
+        # One pooled client for the whole run; over HTTPS, HTTP/2 multiplexes the concurrent tests on one connection
+        if self.mode == "replay":
+            transport = ReplayTransport(self.recording["exchanges"])
+        else:
+            transport = RetryTransport(httpx.AsyncHTTPTransport(
+                http2=True,
+                limits=httpx.Limits(max_keepalive_connections=32, max_connections=64)
+            ))
+            if self.mode == "record":
+                transport = RecordingTransport(transport)
+        self.transport = transport
+        self.session = httpx.AsyncClient(
+            base_url=self.base_url,
+            transport=transport,
+            timeout=10.0,
+            headers={"User-Agent": "sectest/1.0"}
+        )
+        # Open the pooled connection (TCP, TLS and HTTP/2 negotiation) before any test runs; the status is irrelevant
+        try:
+            await self.session.head("/", timeout=3)
+        except httpx.HTTPError:
+            pass
+        cached = self.load_cached_token()
+        if cached:
+            self.auth_token = cached["token"]
+            self.user_data = cached["user"]
+            self.session.headers.update({"Authorization": f"Bearer {self.auth_token}"})
+            self.token_from_cache = True
+            # A cached token can still have been revoked or belong to a wiped database, so it
+            # is checked once up front; if rejected, the run registers and logs in as usual
+            try:
+                response = await self.session.get("/assessments/my-assessments", params={"limit": 1})
+            except httpx.HTTPError:
+                response = None
+            if response is not None and response.status_code in (401, 403):
+                self.log(f"⚠️ Cached token rejected ({response.status_code}) - registering and logging in again", "WARNING")
+                self.discard_cached_token()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.session.aclose()
+        if self.mode == "record":
+            self.recording_path.write_bytes(orjson.dumps({
+                "base_url": self.base_url,
+                "test_user_email": self.test_user_email,
+                "exchanges": self.transport.exchanges
+            }, option=orjson.OPT_INDENT_2))
+            self.log(f"💾 Recorded {len(self.transport.exchanges)} exchanges to {self.recording_path}")
+        # Log lines are buffered during the run so console writes stay out of the timed requests
+        sys.stdout.write(self._log_buffer.getvalue())
+        sys.stdout.flush()
         
+    def load_cached_token(self):
+        """Return the cached login of the reused test account, if there is one that isn't about to expire"""
+        if not REUSED_TEST_EMAIL or self.mode == "replay":
+            return None
+        try:
+            cached = orjson.loads(TOKEN_CACHE_PATH.read_bytes())
+            if cached["base_url"] != self.base_url or cached["email"] != self.test_user_email:
+                return None
+            # Only the expiry is read from the JWT payload here; the server still verifies the token
+            payload = cached["token"].split(".")[1]
+            claims = orjson.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        except (OSError, ValueError, KeyError, IndexError):
+            return None
+        if claims.get("exp", 0) < time.time() + TOKEN_MIN_REMAINING_SECONDS:
+            return None
+        return cached
+    
+    def discard_cached_token(self):
+        """Forget the cached login so registration and login run against the server"""
+        TOKEN_CACHE_PATH.unlink(missing_ok=True)
+        self.auth_token = None
+        self.user_data = None
+        self.session.headers.pop("Authorization", None)
+        self.token_from_cache = False
+    
+    def save_token(self):
+        """Cache the reused test account's token for the next run"""
+        if not REUSED_TEST_EMAIL or self.mode == "replay":
+            return
+        TOKEN_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        TOKEN_CACHE_PATH.write_bytes(orjson.dumps({
+            "base_url": self.base_url,
+            "email": self.test_user_email,
+            "token": self.auth_token,
+            "user": self.user_data
+        }))
+    
     def log(self, message, status="INFO"):
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        print(f"[{timestamp}] {status}: {message}")
+        print(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}] {status}: {message}", file=self._log_buffer)
         
-    def test_api_health(self):
+    async def test_api_health(self):
         """Test if the API is running"""
         try:
-            response = self.session.get(f"{self.base_url}/")
+            response = await self.session.get("/")
             if response.status_code == 200:
                 self.log("✅ API health check passed")
                 return True
@@ -42,33 +277,31 @@ class SecurityAssessmentTester:
             self.log(f"❌ API health check failed: {str(e)}", "ERROR")
             return False
     
-    def test_user_registration(self):
+    async def test_user_registration(self):
         """Test user registration endpoint"""
         try:
-            user_data = {
-                "first_name": "John",
-                "last_name": "Doe",
-                "organization_name": "Test Security Corp",
-                "email": TEST_USER_EMAIL,
-                "corporate_email": f"corporate_{TEST_USER_EMAIL}",
-                "designation": "Security Analyst",
-                "contact_number": "+1234567890",
-                "password": TEST_USER_PASSWORD
-            }
+            if self.token_from_cache:
+                self.log("⏭️ Skipping registration - using the cached token of the reused test account")
+                return True
             
-            response = self.session.post(f"{self.base_url}/auth/register", json=user_data)
+            response = await self.session.post("/auth/register", content=self._register_body, headers=JSON_HEADERS)
             
             if response.status_code == 200:
-                data = response.json()
+                data = parse_json(response)
                 if "token" in data and "user" in data:
                     self.auth_token = data["token"]
                     self.user_data = data["user"]
                     self.session.headers.update({"Authorization": f"Bearer {self.auth_token}"})
+                    self.save_token()
                     self.log(f"✅ User registration successful - User ID: {self.user_data['id']}")
                     return True
                 else:
                     self.log(f"❌ Registration response missing required fields: {data}", "ERROR")
                     return False
+            elif response.status_code == 400 and REUSED_TEST_EMAIL:
+                # The reused account was registered by an earlier run; the login test fetches its token
+                self.log(f"⚠️ Reused test account {self.test_user_email} is already registered", "WARNING")
+                return True
             else:
                 self.log(f"❌ User registration failed: {response.status_code} - {response.text}", "ERROR")
                 return False
@@ -77,22 +310,23 @@ class SecurityAssessmentTester:
             self.log(f"❌ User registration error: {str(e)}", "ERROR")
             return False
     
-    def test_user_login(self):
+    async def test_user_login(self):
         """Test user login endpoint"""
         try:
-            login_data = {
-                "email": TEST_USER_EMAIL,
-                "password": TEST_USER_PASSWORD
-            }
+            if self.token_from_cache:
+                self.log("⏭️ Skipping login - using the cached token of the reused test account")
+                return True
             
-            response = self.session.post(f"{self.base_url}/auth/login", json=login_data)
+            response = await self.session.post("/auth/login", content=self._user_login_body, headers=JSON_HEADERS)
             
             if response.status_code == 200:
-                data = response.json()
+                data = parse_json(response)
                 if "token" in data and "user" in data:
                     # Update token in case it's different
                     self.auth_token = data["token"]
+                    self.user_data = data["user"]
                     self.session.headers.update({"Authorization": f"Bearer {self.auth_token}"})
+                    self.save_token()
                     self.log(f"✅ User login successful - Email: {data['user']['email']}")
                     return True
                 else:
@@ -106,21 +340,20 @@ class SecurityAssessmentTester:
             self.log(f"❌ User login error: {str(e)}", "ERROR")
             return False
     
-    def test_get_domains(self):
+    async def test_get_domains(self):
         """Test domains retrieval endpoint"""
         try:
-            response = self.session.get(f"{self.base_url}/domains")
+            response = await self.session.get("/domains")
             
             if response.status_code == 200:
-                domains = response.json()
+                domains = parse_json(response)
                 if isinstance(domains, list) and len(domains) > 0:
                     self.domains = domains
                     self.log(f"✅ Domains retrieved successfully - Count: {len(domains)}")
                     
                     # Verify domain structure
                     first_domain = domains[0]
-                    required_fields = ["id", "name", "order"]
-                    if all(field in first_domain for field in required_fields):
+                    if DOMAIN_REQUIRED <= first_domain.keys():
                         self.log(f"✅ Domain structure validated - First domain: {first_domain['name']}")
                         return True
                     else:
@@ -137,67 +370,57 @@ class SecurityAssessmentTester:
             self.log(f"❌ Get domains error: {str(e)}", "ERROR")
             return False
     
-    def test_get_domain_questions(self):
-        """Test questions retrieval for first domain"""
+    async def test_get_domain_questions(self):
+        """Test questions retrieval for every domain"""
         try:
             if not self.domains:
                 self.log("❌ No domains available for testing questions", "ERROR")
                 return False
-                
-            first_domain = self.domains[0]
-            domain_id = first_domain["id"]
             
-            response = self.session.get(f"{self.base_url}/domains/{domain_id}/questions")
+            # The domains are independent, so all their question lists are fetched at once
+            responses = await asyncio.gather(
+                *(self.session.get(f"/domains/{domain['id']}/questions") for domain in self.domains)
+            )
             
-            if response.status_code == 200:
-                questions = response.json()
-                if isinstance(questions, list) and len(questions) > 0:
-                    self.questions = questions
-                    self.log(f"✅ Questions retrieved successfully - Count: {len(questions)} for domain: {first_domain['name']}")
-                    
-                    # Verify question structure
-                    first_question = questions[0]
-                    required_fields = ["id", "question_text", "answers", "domain_id"]
-                    if all(field in first_question for field in required_fields):
-                        answers = first_question["answers"]
-                        if isinstance(answers, list) and len(answers) > 0:
-                            self.log(f"✅ Question structure validated - Answers count: {len(answers)}")
-                            return True
-                        else:
-                            self.log("❌ Question has no answers", "ERROR")
-                            return False
-                    else:
-                        self.log(f"❌ Question missing required fields: {first_question}", "ERROR")
-                        return False
-                else:
-                    self.log(f"❌ No questions found for domain {first_domain['name']}", "ERROR")
+            all_questions = []
+            for domain, response in zip(self.domains, responses):
+                if response.status_code != 200:
+                    self.log(f"❌ Get domain questions failed: {response.status_code} - {response.text}", "ERROR")
                     return False
-            else:
-                self.log(f"❌ Get domain questions failed: {response.status_code} - {response.text}", "ERROR")
-                return False
+                
+                questions = parse_json(response)
+                if not isinstance(questions, list) or len(questions) == 0:
+                    self.log(f"❌ No questions found for domain {domain['name']}", "ERROR")
+                    return False
+                self.log(f"✅ Questions retrieved successfully - Count: {len(questions)} for domain: {domain['name']}")
+                
+                # Verify question structure
+                first_question = questions[0]
+                if not QUESTION_REQUIRED <= first_question.keys():
+                    self.log(f"❌ Question missing required fields: {first_question}", "ERROR")
+                    return False
+                answers = first_question["answers"]
+                if not isinstance(answers, list) or len(answers) == 0:
+                    self.log("❌ Question has no answers", "ERROR")
+                    return False
+                all_questions.extend(questions)
+            
+            self.questions = all_questions
+            self.log(f"✅ Question structure validated - Total questions: {len(all_questions)} across {len(self.domains)} domains")
+            return True
                 
         except Exception as e:
             self.log(f"❌ Get domain questions error: {str(e)}", "ERROR")
             return False
     
-    def test_submit_assessment(self):
+    async def test_submit_assessment(self):
         """Test assessment submission with sample responses"""
         try:
             if not self.questions:
                 self.log("❌ No questions available for assessment submission", "ERROR")
                 return False
             
-            # Create sample responses - select middle answers (score 2-3)
-            responses = []
-            for question in self.questions:
-                answers = question["answers"]
-                if len(answers) >= 3:
-                    # Select middle answer for variety
-                    selected_answer = answers[len(answers) // 2]
-                    responses.append({
-                        "question_id": question["id"],
-                        "selected_answer_id": selected_answer["id"]
-                    })
+            responses = build_responses(self.questions)
             
             if not responses:
                 self.log("❌ No valid responses could be created", "ERROR")
@@ -205,10 +428,10 @@ class SecurityAssessmentTester:
             
             submission_data = {"responses": responses}
             
-            response = self.session.post(f"{self.base_url}/assessments/submit", json=submission_data)
+            response = await self.session.post("/assessments/submit", content=orjson.dumps(submission_data), headers=JSON_HEADERS)
             
             if response.status_code == 200:
-                data = response.json()
+                data = parse_json(response)
                 if "assessment_id" in data and "message" in data:
                     self.assessment_id = data["assessment_id"]
                     self.log(f"✅ Assessment submitted successfully - ID: {self.assessment_id}")
@@ -225,21 +448,21 @@ class SecurityAssessmentTester:
             self.log(f"❌ Assessment submission error: {str(e)}", "ERROR")
             return False
     
-    def test_get_user_assessments(self):
+    async def test_get_user_assessments(self):
         """Test user assessments retrieval"""
         try:
-            response = self.session.get(f"{self.base_url}/assessments/my-assessments")
+            response = await self.session.get("/assessments/my-assessments")
             
             if response.status_code == 200:
-                assessments = response.json()
+                assessments = parse_json(response)
                 if isinstance(assessments, list):
-                    self.log(f"✅ User assessments retrieved successfully - Count: {len(assessments)}")
+                    count = len(assessments)
+                    self.log(f"✅ User assessments retrieved successfully - Count: {count}")
                     
-                    if len(assessments) > 0:
+                    if count > 0:
                         # Verify assessment structure
                         first_assessment = assessments[0]
-                        required_fields = ["id", "user_id", "submission_date", "status"]
-                        if all(field in first_assessment for field in required_fields):
+                        if ASSESSMENT_REQUIRED <= first_assessment.keys():
                             self.log("✅ Assessment structure validated")
                             return True
                         else:
@@ -259,28 +482,28 @@ class SecurityAssessmentTester:
             self.log(f"❌ Get user assessments error: {str(e)}", "ERROR")
             return False
     
-    def test_get_assessment_stats(self):
+    async def test_get_assessment_stats(self):
         """Test assessment statistics retrieval"""
         try:
             if not self.assessment_id:
                 self.log("❌ No assessment ID available for stats testing", "ERROR")
                 return False
             
-            response = self.session.get(f"{self.base_url}/dashboard/stats/{self.assessment_id}")
+            response = await self.session.get(f"/dashboard/stats/{self.assessment_id}")
             
             if response.status_code == 200:
-                stats = response.json()
-                required_fields = ["total_responses", "domains_completed", "overall_average"]
-                if all(field in stats for field in required_fields):
+                stats = parse_json(response)
+                if STATS_REQUIRED <= stats.keys():
+                    total_responses, domains_completed, overall_average = (
+                        stats["total_responses"], stats["domains_completed"], stats["overall_average"]
+                    )
                     self.log(f"✅ Assessment stats retrieved successfully")
-                    self.log(f"   - Total responses: {stats['total_responses']}")
-                    self.log(f"   - Domains completed: {stats['domains_completed']}")
-                    self.log(f"   - Overall average: {stats['overall_average']}")
+                    self.log(f"   - Total responses: {total_responses}")
+                    self.log(f"   - Domains completed: {domains_completed}")
+                    self.log(f"   - Overall average: {overall_average}")
                     
                     # Validate stats make sense
-                    if (stats["total_responses"] > 0 and 
-                        stats["domains_completed"] > 0 and 
-                        0 <= stats["overall_average"] <= 5):
+                    if total_responses > 0 and domains_completed > 0 and 0 <= overall_average <= 5:
                         self.log("✅ Assessment stats validation passed")
                         return True
                     else:
@@ -297,18 +520,13 @@ class SecurityAssessmentTester:
             self.log(f"❌ Get assessment stats error: {str(e)}", "ERROR")
             return False
     
-    def test_admin_login(self):
+    async def test_admin_login(self):
         """Test admin user login with default credentials"""
         try:
-            login_data = {
-                "email": "admin@secassess.com",
-                "password": "admin123"
-            }
-            
-            response = self.session.post(f"{self.base_url}/auth/login", json=login_data)
+            response = await self.session.post("/auth/login", content=self._admin_login_body, headers=JSON_HEADERS)
             
             if response.status_code == 200:
-                data = response.json()
+                data = parse_json(response)
                 if "token" in data and "user" in data:
                     if data["user"]["role"] == "admin":
                         self.log(f"✅ Admin login successful - Role: {data['user']['role']}")
@@ -327,13 +545,13 @@ class SecurityAssessmentTester:
             self.log(f"❌ Admin login error: {str(e)}", "ERROR")
             return False
     
-    def test_data_initialization(self):
+    async def test_data_initialization(self):
         """Test sample data initialization endpoint"""
         try:
-            response = self.session.post(f"{self.base_url}/admin/init-data")
+            response = await self.session.post("/admin/init-data")
             
             if response.status_code == 200:
-                data = response.json()
+                data = parse_json(response)
                 if "message" in data:
                     self.log(f"✅ Data initialization endpoint working - Message: {data['message']}")
                     return True
@@ -348,19 +566,14 @@ class SecurityAssessmentTester:
             self.log(f"❌ Data initialization error: {str(e)}", "ERROR")
             return False
     
-    def test_authentication_middleware(self):
+    async def test_authentication_middleware(self):
         """Test that protected endpoints require authentication"""
         try:
-            # Remove auth header temporarily
-            original_headers = self.session.headers.copy()
-            if "Authorization" in self.session.headers:
-                del self.session.headers["Authorization"]
-            
-            # Try to access protected endpoint
-            response = self.session.get(f"{self.base_url}/assessments/my-assessments")
-            
-            # Restore headers
-            self.session.headers = original_headers
+            # Try to access protected endpoint - the header is dropped from this one request only, so tests
+            # running concurrently keep the session's credentials
+            request = self.session.build_request("GET", "/assessments/my-assessments")
+            request.headers.pop("Authorization", None)
+            response = await self.session.send(request)
             
             if response.status_code in [401, 403]:
                 self.log(f"✅ Authentication middleware working - Unauthorized access blocked (HTTP {response.status_code})")
@@ -373,43 +586,64 @@ class SecurityAssessmentTester:
             self.log(f"❌ Authentication middleware test error: {str(e)}", "ERROR")
             return False
     
-    def run_all_tests(self):
-        """Run all backend tests in sequence"""
+    async def run_test(self, test_name, test_func):
+        """Run a single test, logging and returning its result"""
+        self.log(f"\n📋 Running: {test_name}")
+        try:
+            result = await test_func()
+            if result:
+                self.log(f"✅ {test_name} PASSED")
+            else:
+                self.log(f"❌ {test_name} FAILED")
+            return result
+        except Exception as e:
+            self.log(f"❌ {test_name} ERROR: {str(e)}", "ERROR")
+            return False
+    
+    async def run_all_tests(self):
+        """Run all backend tests, each one as soon as the tests it depends on have finished"""
         self.log("🚀 Starting Security Assessment App Backend Testing")
         self.log(f"🔗 Testing against: {self.base_url}")
-        self.log(f"👤 Test user email: {TEST_USER_EMAIL}")
+        self.log(f"👤 Test user email: {self.test_user_email}")
         
         tests = [
             ("API Health Check", self.test_api_health),
             ("Data Initialization", self.test_data_initialization),
             ("Admin Login", self.test_admin_login),
+            ("Authentication Middleware", self.test_authentication_middleware),
             ("User Registration", self.test_user_registration),
             ("User Login", self.test_user_login),
-            ("Authentication Middleware", self.test_authentication_middleware),
             ("Get Domains", self.test_get_domains),
             ("Get Domain Questions", self.test_get_domain_questions),
             ("Submit Assessment", self.test_submit_assessment),
             ("Get User Assessments", self.test_get_user_assessments),
             ("Get Assessment Stats", self.test_get_assessment_stats),
         ]
+        # Tests that need sample data or state saved by an earlier test wait for it; the rest start immediately
+        deps = {
+            "Admin Login": ["Data Initialization"],
+            "User Login": ["User Registration"],
+            "Get Domains": ["Data Initialization"],
+            "Get Domain Questions": ["Get Domains"],
+            "Submit Assessment": ["Get Domain Questions", "User Login"],
+            "Get User Assessments": ["Submit Assessment"],
+            "Get Assessment Stats": ["Submit Assessment"],
+        }
         
-        results = {}
-        passed = 0
-        total = len(tests)
+        tasks = {}
         
-        for test_name, test_func in tests:
-            self.log(f"\n📋 Running: {test_name}")
-            try:
-                result = test_func()
-                results[test_name] = result
-                if result:
-                    passed += 1
-                    self.log(f"✅ {test_name} PASSED")
-                else:
-                    self.log(f"❌ {test_name} FAILED")
-            except Exception as e:
-                self.log(f"❌ {test_name} ERROR: {str(e)}", "ERROR")
-                results[test_name] = False
+        async def run_after_deps(test_name, test_func):
+            await asyncio.gather(*(tasks[dep] for dep in deps.get(test_name, [])))
+            return await self.run_test(test_name, test_func)
+        
+        # All tasks exist before any of them runs, so every dependency can be looked up
+        async with asyncio.TaskGroup() as task_group:
+            for test_name, test_func in tests:
+                tasks[test_name] = task_group.create_task(run_after_deps(test_name, test_func))
+        results = {test_name: tasks[test_name].result() for test_name, _ in tests}
+        
+        passed = sum(1 for result in results.values() if result)
+        total = len(results)
         
         # Summary
         self.log(f"\n📊 TEST SUMMARY")
@@ -428,6 +662,18 @@ class SecurityAssessmentTester:
         
         return results
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Security Assessment App backend API tests")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--record", action="store_true", help="run against the API and save every exchange")
+    mode.add_argument("--replay", action="store_true", help="serve saved exchanges instead of calling the API")
+    parser.add_argument("--recording", type=Path, default=RECORDING_PATH, help=f"recording file (default: {RECORDING_PATH})")
+    return parser.parse_args()
+
+async def main(args):
+    mode = "record" if args.record else "replay" if args.replay else "live"
+    async with SecurityAssessmentTester(mode, args.recording) as tester:
+        return await tester.run_all_tests()
+
 if __name__ == "__main__":
-    tester = SecurityAssessmentTester()
-    results = tester.run_all_tests()
\ No newline at end of file
+    results = asyncio.run(main(parse_args()))
\ No newline at end of file